@@ -2,6 +2,8 @@
 アプリケーション設定管理
 """
 import os
+import functools
+from typing import NamedTuple, Optional, Tuple
 from dotenv import load_dotenv
 
 # 環境変数を読み込み
@@ -27,40 +29,91 @@ class Config:
     STATIC_PATH = os.path.join(os.path.dirname(__file__), '..', 'static')
 
 
+class _OAuthEnv(NamedTuple):
+    """OAuthConfig に展開する設定値（型変換・必須チェック済み）"""
+    GOOGLE_CLIENT_ID: str
+    GOOGLE_CLIENT_SECRET: str
+    GOOGLE_REDIRECT_URI: str
+    FACEBOOK_APP_ID: str
+    FACEBOOK_APP_SECRET: str
+    FACEBOOK_REDIRECT_URI: str
+    SMTP_HOST: str
+    SMTP_PORT: int
+    SMTP_USERNAME: str
+    SMTP_PASSWORD: str
+    SMTP_USE_TLS: bool
+    ACCESS_CONTROL_RULES: str
+    EMAIL_ENCRYPTION_KEY: str
+    EMAIL_HASH_SALT: str
+
+
+# 必須項目を表す番兵
+_REQUIRED = object()
+
+
+# 真とみなす文字列（小文字化して比較する）
+_TRUTHY = frozenset({'true', '1', 'yes', 'on', 't', 'y'})
+
+
+def _parse_bool(value: str) -> bool:
+    return value.lower() in _TRUTHY
+
+
+# 環境変数名 -> (デフォルト値 または _REQUIRED, 型変換関数)。_OAuthEnv のフィールド順に並べる
+_OAUTH_ENV_SPEC = (
+    # Google OAuth設定 (必須)
+    ('GOOGLE_CLIENT_ID', _REQUIRED, str),
+    ('GOOGLE_CLIENT_SECRET', _REQUIRED, str),
+    ('GOOGLE_REDIRECT_URI', 'https://localhost:8202/auth/google/callback', str),
+
+    # Facebook OAuth設定 (必須)
+    ('FACEBOOK_APP_ID', '', str),
+    ('FACEBOOK_APP_SECRET', '', str),
+    ('FACEBOOK_REDIRECT_URI', 'https://localhost:8202/auth/facebook/callback', str),
+
+    # SMTP設定 (必須)
+    ('SMTP_HOST', _REQUIRED, str),
+    ('SMTP_PORT', '587', int),
+    ('SMTP_USERNAME', '', str),
+    ('SMTP_PASSWORD', '', str),
+    ('SMTP_USE_TLS', 'True', _parse_bool),
+
+    # アクセス制御設定
+    ('ACCESS_CONTROL_RULES', '', str),
+
+    # 暗号化設定
+    ('EMAIL_ENCRYPTION_KEY', '', str),
+    ('EMAIL_HASH_SALT', '', str),
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_oauth_env(raw_values: Tuple[Optional[str], ...]) -> _OAuthEnv:
+    """環境変数の生の値から設定値を構築する（同じ値の組み合わせでは再計算しない）"""
+    values = []
+    for (key, default, coerce), value in zip(_OAUTH_ENV_SPEC, raw_values):
+        if default is _REQUIRED and not value:
+            raise ValueError(f"{key} is required")
+        # 未設定 (None) の項目だけデフォルト値を使う
+        values.append(coerce(default if value is None else value))
+    return _OAuthEnv(*values)
+
+
 class OAuthConfig:
     """OAuth認証サービス設定クラス"""
 
+    __slots__ = _OAuthEnv._fields
+
     def __init__(self):
-        # Google OAuth設定 (必須)
-        self.GOOGLE_CLIENT_ID = self._get_required_env('GOOGLE_CLIENT_ID')
-        self.GOOGLE_CLIENT_SECRET = self._get_required_env('GOOGLE_CLIENT_SECRET')
-        self.GOOGLE_REDIRECT_URI = os.getenv('GOOGLE_REDIRECT_URI', 'https://localhost:8202/auth/google/callback')
-
-        # Facebook OAuth設定 (必須)
-        self.FACEBOOK_APP_ID = os.getenv('FACEBOOK_APP_ID', '')
-        self.FACEBOOK_APP_SECRET = os.getenv('FACEBOOK_APP_SECRET', '')
-        self.FACEBOOK_REDIRECT_URI = os.getenv('FACEBOOK_REDIRECT_URI', 'https://localhost:8202/auth/facebook/callback')
-
-        # SMTP設定 (必須)
-        self.SMTP_HOST = self._get_required_env('SMTP_HOST')
-        self.SMTP_PORT = int(os.getenv('SMTP_PORT', '587'))
-        self.SMTP_USERNAME = os.getenv('SMTP_USERNAME', '')
-        self.SMTP_PASSWORD = os.getenv('SMTP_PASSWORD', '')
-        self.SMTP_USE_TLS = os.getenv('SMTP_USE_TLS', 'True').lower() == 'true'
-
-        # アクセス制御設定
-        self.ACCESS_CONTROL_RULES = os.getenv('ACCESS_CONTROL_RULES', '')
-
-        # 暗号化設定
-        self.EMAIL_ENCRYPTION_KEY = os.getenv('EMAIL_ENCRYPTION_KEY', '')
-        self.EMAIL_HASH_SALT = os.getenv('EMAIL_HASH_SALT', '')
-
-    def _get_required_env(self, key: str) -> str:
-        """必須環境変数を取得"""
-        value = os.getenv(key)
-        if not value:
-            raise ValueError(f"{key} is required")
-        return value
+        # 環境変数の値が前回と同じであれば、型変換・必須チェック済みの結果を再利用する
+        raw_values = tuple(map(os.environ.get, _OAuthEnv._fields))
+        for name, value in zip(_OAuthEnv._fields, _load_oauth_env(raw_values)):
+            setattr(self, name, value)
+
+    @staticmethod
+    def invalidate_cache():
+        """キャッシュ済みの設定値を破棄する"""
+        _load_oauth_env.cache_clear()
 
 
 def get_app_config():
@@ -97,7 +97,7 @@ class DatabaseService:
         except Exception as e:
             logger.error(f"create エラー: {e}")
             raise
-    
+
     async def delete_one(self, collection: str, filter_dict: dict):
         """単一ドキュメントを削除"""
         try:
@@ -191,6 +191,19 @@ class DatabaseService:
         except Exception as e:
             logger.error(f"delete_many エラー: {e}")
             raise
+
+    async def drop_collection(self, collection: str):
+        """コレクションを削除（全ドキュメント削除よりも高速なメタデータ操作）"""
+        try:
+            if not self.client:
+                await self.connect()
+
+            collection_obj = self.db[collection]
+            await collection_obj.drop()
+
+        except Exception as e:
+            logger.error(f"drop_collection エラー: {e}")
+            raise
     
     async def count_documents(self, collection: str, filter_dict: dict = None):
         """ドキュメント数をカウント"""
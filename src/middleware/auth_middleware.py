@@ -2,7 +2,8 @@
 認証・認可ミドルウェア
 """
 import logging
-from typing import Optional
+import time
+from typing import Dict, Optional, Tuple
 from datetime import datetime
 from ..services.session_service import SessionService
 from ..services.user_service import UserService
@@ -24,13 +25,21 @@ class InsufficientPermissions(Exception):
 
 class AuthMiddleware:
     """認証・認可ミドルウェア"""
+
+    # セッション辞書から取得したユーザー情報のキャッシュ（有効期間（秒）と上限件数）
+    USER_CACHE_TTL_SECONDS = 60
+    USER_CACHE_SIZE = 10000
     
     def __init__(self, db_service=None):
         from ..database import DatabaseService
         if db_service is None:
             db_service = DatabaseService()
         self.session_service = SessionService(db_service)
-        self.user_service = UserService(db_service)
+        # ミドルウェア経由のプロフィール更新・無効化ではキャッシュ済みのユーザー情報を破棄する
+        self.user_service = UserService(db_service, on_user_changed=self.invalidate_user)
+        # ユーザーID -> (有効期限（time.monotonic 基準）, ユーザー情報)。
+        # アクティブなユーザーのみ、古い順に保持する
+        self._user_cache: Dict[str, Tuple[float, dict]] = {}
     
     async def get_user_from_session(self, session_id: str) -> Result[User, Exception]:
         """セッションからユーザーを取得"""
@@ -114,15 +123,24 @@ class AuthMiddleware:
         if not session_data or "user_id" not in session_data:
             return None
 
+        user_id = session_data["user_id"]
+        now = time.monotonic()
+
+        # 有効期間内に取得済みのユーザーはデータベースに問い合わせない
+        cached = self._user_cache.get(user_id)
+        if cached is not None and cached[0] > now:
+            return dict(cached[1])
+
         user_doc = await self.user_service.db_service.find_one(
             'users',
-            {'_id': session_data["user_id"]}
+            {'_id': user_id}
         )
 
         if not user_doc or not user_doc.get('is_active', True):
+            self._user_cache.pop(user_id, None)
             return None
 
-        return {
+        user_info = {
             'user_id': user_doc['_id'],
             'email': user_doc.get('email'),
             'name': user_doc.get('name'),
@@ -131,10 +149,23 @@ class AuthMiddleware:
             'position': user_doc.get('position')
         }
 
+        # 期限切れのエントリは取り除いてから末尾に入れ直し、
+        # 上限に達したら最も古いエントリだけを追い出す
+        self._user_cache.pop(user_id, None)
+        if len(self._user_cache) >= self.USER_CACHE_SIZE:
+            del self._user_cache[next(iter(self._user_cache))]
+        self._user_cache[user_id] = (now + self.USER_CACHE_TTL_SECONDS, user_info)
+        return dict(user_info)
+
+    def invalidate_user(self, user_id: str) -> None:
+        """キャッシュ済みのユーザー情報を破棄（プロフィール更新・無効化時に呼び出す）"""
+        self._user_cache.pop(user_id, None)
+
     async def validate_session_token(self, token: str) -> bool:
         """セッショントークンの検証"""
         try:
-            if not token:
+            # 空・空白のみのトークンはセッションサービスに問い合わせずに無効とする
+            if not token or token.isspace():
                 return False
 
             # セッション検証
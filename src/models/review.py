@@ -1,11 +1,16 @@
 """
 レビューデータモデル
 """
+import sys
 from dataclasses import dataclass
 from typing import Optional, Dict, Union
 from datetime import datetime
 from enum import Enum
 
+# 一覧表示などで大量に生成されるモデルは __slots__ 付きで定義する
+# （Python 3.10以降の dataclass でのみ指定可能）
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 
 class EmploymentStatus(Enum):
     """在職状況"""
@@ -23,7 +28,7 @@ class ReviewCategory(Enum):
     PROMOTION_TREATMENT = "promotion_treatment"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class EmploymentPeriod:
     """勤務期間データ"""
     start_year: int
@@ -67,7 +72,7 @@ class EmploymentPeriod:
             return f"{self.start_year}年〜{self.end_year}年"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Review:
     """レビューデータモデル"""
     id: str
@@ -2,20 +2,45 @@
 OAuth Configuration Service
 OAuth認証設定の管理とバリデーション
 """
+import io
 import os
+import functools
 import logging
-from typing import Dict, List, Any
-from dotenv import load_dotenv
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional, Tuple
+from dotenv import dotenv_values
 from ..config import OAuthConfig
 
 logger = logging.getLogger(__name__)
 
 
+def _parse_dotenv_uncached(content: str) -> Tuple[Tuple[str, str], ...]:
+    """Parse .env file contents"""
+    # 値のないキー (None) は load_dotenv と同様に環境変数へ反映しない
+    return tuple(
+        (key, value)
+        for key, value in dotenv_values(stream=io.StringIO(content)).items()
+        if value is not None
+    )
+
+
+@functools.lru_cache(maxsize=16)
+def _parse_dotenv(content: str) -> Tuple[Tuple[str, str], ...]:
+    """Parse .env file contents (cached per distinct contents)"""
+    return _parse_dotenv_uncached(content)
+
+
 class OAuthConfigService:
     """OAuth configuration management service"""
 
     def __init__(self):
         self._config = None
+        self._access_rules = ()
+        self._encryption_key_error = None
+        self._google_cfg = None
+        self._facebook_cfg = None
+        self._smtp_cfg = None
+        self._enc_cfg = None
         self.load_config()
 
     def load_config(self):
@@ -26,90 +51,129 @@ class OAuthConfigService:
             logger.error(f"Failed to load OAuth config: {e}")
             raise
 
+        # アクセス制御ルールは設定の読み込み時に一度だけ解析する
+        self._access_rules = self._parse_rules(self._config.ACCESS_CONTROL_RULES)
+
+        # 暗号化キーも読み込み時に一度だけ検証し、結果を保持する
+        self._encryption_key_error = self._check_encryption_key(self._config.EMAIL_ENCRYPTION_KEY)
+
+        # 設定セクションのキャッシュは読み込み直しのたびに破棄する
+        self._google_cfg = None
+        self._facebook_cfg = None
+        self._smtp_cfg = None
+        self._enc_cfg = None
+
     def refresh_config(self):
         """Refresh configuration from environment"""
+        OAuthConfig.invalidate_cache()
         self.load_config()
 
-    def get_google_oauth_config(self) -> Dict[str, str]:
-        """Get Google OAuth configuration"""
-        return {
-            'client_id': self._config.GOOGLE_CLIENT_ID,
-            'client_secret': self._config.GOOGLE_CLIENT_SECRET,
-            'redirect_uri': self._config.GOOGLE_REDIRECT_URI
-        }
-
-    def get_facebook_oauth_config(self) -> Dict[str, str]:
-        """Get Facebook OAuth configuration"""
-        return {
-            'app_id': self._config.FACEBOOK_APP_ID,
-            'app_secret': self._config.FACEBOOK_APP_SECRET,
-            'redirect_uri': self._config.FACEBOOK_REDIRECT_URI
-        }
-
-    def get_smtp_config(self) -> Dict[str, Any]:
-        """Get SMTP configuration"""
-        return {
-            'host': self._config.SMTP_HOST,
-            'port': self._config.SMTP_PORT,
-            'username': self._config.SMTP_USERNAME,
-            'password': self._config.SMTP_PASSWORD,
-            'use_tls': self._config.SMTP_USE_TLS
-        }
-
-    def get_encryption_config(self) -> Dict[str, str]:
-        """Get encryption configuration"""
-        return {
-            'encryption_key': self._config.EMAIL_ENCRYPTION_KEY,
-            'hash_salt': self._config.EMAIL_HASH_SALT
-        }
+    def get_google_oauth_config(self) -> Mapping[str, str]:
+        """Get Google OAuth configuration (read-only, cached until refresh)"""
+        if self._google_cfg is None:
+            self._google_cfg = MappingProxyType({
+                'client_id': self._config.GOOGLE_CLIENT_ID,
+                'client_secret': self._config.GOOGLE_CLIENT_SECRET,
+                'redirect_uri': self._config.GOOGLE_REDIRECT_URI
+            })
+        return self._google_cfg
+
+    def get_facebook_oauth_config(self) -> Mapping[str, str]:
+        """Get Facebook OAuth configuration (read-only, cached until refresh)"""
+        if self._facebook_cfg is None:
+            self._facebook_cfg = MappingProxyType({
+                'app_id': self._config.FACEBOOK_APP_ID,
+                'app_secret': self._config.FACEBOOK_APP_SECRET,
+                'redirect_uri': self._config.FACEBOOK_REDIRECT_URI
+            })
+        return self._facebook_cfg
+
+    def get_smtp_config(self) -> Mapping[str, Any]:
+        """Get SMTP configuration (read-only, cached until refresh)"""
+        if self._smtp_cfg is None:
+            self._smtp_cfg = MappingProxyType({
+                'host': self._config.SMTP_HOST,
+                'port': self._config.SMTP_PORT,
+                'username': self._config.SMTP_USERNAME,
+                'password': self._config.SMTP_PASSWORD,
+                'use_tls': self._config.SMTP_USE_TLS
+            })
+        return self._smtp_cfg
+
+    def get_encryption_config(self) -> Mapping[str, str]:
+        """Get encryption configuration (read-only, cached until refresh)"""
+        if self._enc_cfg is None:
+            self._enc_cfg = MappingProxyType({
+                'encryption_key': self._config.EMAIL_ENCRYPTION_KEY,
+                'hash_salt': self._config.EMAIL_HASH_SALT
+            })
+        return self._enc_cfg
 
     def parse_access_control_rules(self) -> List[Dict[str, Any]]:
-        """Parse access control rules from environment"""
-        rules_str = self._config.ACCESS_CONTROL_RULES
+        """Get access control rules parsed from environment (independent copies)"""
+        # ルールの辞書とパーミッションのリストもコピーし、
+        # 呼び出し側の変更が保持中のルールに影響しないようにする
+        return [
+            {
+                'url_pattern': rule['url_pattern'],
+                'required_permissions': list(rule['required_permissions'])
+            }
+            for rule in self._access_rules
+        ]
+
+    @staticmethod
+    def _parse_rules(rules_str: str) -> Tuple[Dict[str, Any], ...]:
+        """Parse access control rules string"""
         if not rules_str:
-            return []
+            return ()
 
-        rules = []
         # Format: "/path1,perm1,perm2;/path2,perm3,perm4"
-        rule_pairs = rules_str.split(';')
-
-        for rule_pair in rule_pairs:
-            if not rule_pair.strip():
-                continue
-
-            parts = rule_pair.split(',')
-            if len(parts) < 2:
-                continue
-
-            url_pattern = parts[0].strip()
-            required_permissions = [perm.strip() for perm in parts[1:]]
-
-            rules.append({
-                'url_pattern': url_pattern,
-                'required_permissions': required_permissions
-            })
-
-        return rules
+        # 空のセグメントとパーミッションを持たないセグメントは無視する
+        return tuple(
+            {
+                'url_pattern': parts[0].strip(),
+                'required_permissions': [perm.strip() for perm in parts[1:]]
+            }
+            for parts in (
+                rule_pair.split(',') for rule_pair in rules_str.split(';') if rule_pair.strip()
+            )
+            if len(parts) >= 2
+        )
 
     def validate_encryption_key(self) -> bool:
         """Validate encryption key format and length"""
-        encryption_key = self._config.EMAIL_ENCRYPTION_KEY
+        if self._encryption_key_error:
+            raise ValueError(self._encryption_key_error)
+        return True
+
+    @staticmethod
+    def _check_encryption_key(encryption_key: str) -> Optional[str]:
+        """Check encryption key and return an error message if invalid"""
         if not encryption_key:
-            raise ValueError("EMAIL_ENCRYPTION_KEY is required")
+            return "EMAIL_ENCRYPTION_KEY is required"
 
         # 暗号化キーは最低32バイト必要
         if len(encryption_key.encode('utf-8')) < 32:
-            raise ValueError("Encryption key must be at least 32 bytes")
+            return "Encryption key must be at least 32 bytes"
 
-        return True
+        return None
 
     def load_dotenv_config(self, dotenv_path: str = '.env'):
         """Load configuration from .env file"""
-        if os.path.exists(dotenv_path):
-            load_dotenv(dotenv_path, override=True)
-            self.refresh_config()
-        else:
+        # 存在確認と読み込みを分けず、一度だけ開いて内容を読む
+        # （確認後の削除・差し替えで失敗しないように）
+        try:
+            with open(dotenv_path, encoding='utf-8') as f:
+                content = f.read()
+        except FileNotFoundError:
             logger.warning(f"Dotenv file not found: {dotenv_path}")
+            return
+
+        # 内容が前回と同じであれば解析結果を再利用する。
+        # ${VAR} の参照は解析時点の環境変数で展開されるため、含まれる場合は毎回解析し直す
+        parse = _parse_dotenv_uncached if '${' in content else _parse_dotenv
+        os.environ.update(parse(content))
+        self.refresh_config()
 
     def validate_all_configs(self) -> Dict[str, bool]:
         """Validate all configuration sections"""
@@ -1,13 +1,39 @@
 """
 レビュー集計サービス
 """
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, Any, Optional
 from datetime import datetime
 from bson import ObjectId
+from src.models.review import ReviewCategory
 
 logger = logging.getLogger(__name__)
 
+# 集計対象の評価カテゴリ（ReviewCategory の定義順）
+CATEGORIES = tuple(category.value for category in ReviewCategory)
+
+# 企業単位の集計を行う $group ステージ（$avg は None・欠損値を除外して平均する）
+_SUMMARY_GROUP_STAGE = {
+    "$group": {
+        "_id": None,
+        "total_reviews": {"$sum": 1},
+        **{category: {"$avg": f"$ratings.{category}"} for category in CATEGORIES},
+        "last_review_date": {"$max": "$created_at"}
+    }
+}
+
+# 集計元レビューの状態（全件数・アクティブ件数・最終更新日時）を求める $group ステージ
+# アクティブ件数も含め、updated_at を変えずに is_active だけを切り替えた場合も状態が変わるようにする
+_SOURCE_STATE_GROUP_STAGE = {
+    "$group": {
+        "_id": None,
+        "review_count": {"$sum": 1},
+        "active_count": {"$sum": {"$cond": [{"$eq": ["$is_active", True]}, 1, 0]}},
+        "last_modified": {"$max": "$updated_at"}
+    }
+}
+
 
 class ReviewAggregationService:
     """企業単位でレビューデータを集計するサービス"""
@@ -19,42 +45,29 @@ class ReviewAggregationService:
         """
         self.db = db_service
 
-    def calculate_category_averages(self, reviews: List[Dict[str, Any]]) -> Dict[str, float]:
+    async def create_review_aggregation_indexes(self) -> bool:
         """
-        カテゴリ別評価平均を計算（None値を除外）
+        レビュー集計クエリ用のMongoDBインデックスを作成
 
-        Args:
-            reviews: レビューのリスト
+        aggregate_company_reviews の $match（company_id + is_active）を
+        コレクション全体の走査なしで解決するための複合インデックス。
+        created_at の降順を末尾に含め、最終レビュー投稿日時の算出にも使う。
 
         Returns:
-            カテゴリ別評価平均の辞書
+            bool: インデックス作成が成功した場合True、失敗した場合False
         """
-        categories = [
-            "recommendation",
-            "foreign_support",
-            "company_culture",
-            "employee_relations",
-            "evaluation_system",
-            "promotion_treatment"
-        ]
-
-        category_averages = {}
-
-        for category in categories:
-            # 有効な評価値（None以外）を抽出
-            valid_ratings = [
-                review["ratings"][category]
-                for review in reviews
-                if review.get("ratings", {}).get(category) is not None
-            ]
-
-            # 平均計算
-            if valid_ratings:
-                category_averages[category] = sum(valid_ratings) / len(valid_ratings)
-            else:
-                category_averages[category] = 0.0
+        try:
+            await self.db.create_index(
+                "reviews",
+                [("company_id", 1), ("is_active", 1), ("created_at", -1)]
+            )
+
+            logger.info("レビュー集計用のインデックスを作成しました")
+            return True
 
-        return category_averages
+        except Exception as e:
+            logger.exception("レビュー集計インデックス作成エラー: %s", e)
+            return False
 
     def calculate_overall_average(self, category_averages: Dict[str, float]) -> float:
         """
@@ -95,48 +108,42 @@ class ReviewAggregationService:
                     "error": f"Invalid company_id format: {company_id}"
                 }
 
-            # 対象企業のすべてのアクティブなレビューを取得
+            # 対象企業のアクティブなレビューをデータベース側で集計する（レビュー本体は取得しない）
             # company_idは文字列として保存されているため、文字列で検索
-            reviews = await self.db.find_many(
-                "reviews",
-                {"company_id": company_id, "is_active": True},
-                sort=[("created_at", -1)]
-            )
+            summaries = await self.db.aggregate("reviews", [
+                {"$match": {"company_id": company_id, "is_active": True}},
+                _SUMMARY_GROUP_STAGE
+            ])
 
-            # レビュー総数
-            total_reviews = len(reviews)
-
-            # レビューが0件の場合
-            if total_reviews == 0:
+            # レビューが0件の場合（一致するドキュメントがなければ $group は結果を返さない）
+            if not summaries:
                 return {
                     "success": True,
                     "company_id": company_id,
                     "total_reviews": 0,
                     "overall_average": 0.0,
-                    "category_averages": {
-                        "recommendation": 0.0,
-                        "foreign_support": 0.0,
-                        "company_culture": 0.0,
-                        "employee_relations": 0.0,
-                        "evaluation_system": 0.0,
-                        "promotion_treatment": 0.0
-                    },
+                    "category_averages": dict.fromkeys(CATEGORIES, 0.0),
                     "last_review_date": None
                 }
 
-            # カテゴリ別評価平均を計算
-            category_averages = self.calculate_category_averages(reviews)
+            summary = summaries[0]
+
+            # カテゴリ別評価平均（有効な評価値がないカテゴリは $avg が None を返すため0.0とする）
+            category_averages = {
+                category: float(summary[category]) if summary.get(category) is not None else 0.0
+                for category in CATEGORIES
+            }
 
             # 総合評価平均を計算
             overall_average = self.calculate_overall_average(category_averages)
 
-            # 最終レビュー投稿日時を取得（最新のレビュー）
-            last_review_date = reviews[0]["created_at"] if reviews else None
+            # 最終レビュー投稿日時（最新のレビュー）
+            last_review_date = summary["last_review_date"]
 
             return {
                 "success": True,
                 "company_id": company_id,
-                "total_reviews": total_reviews,
+                "total_reviews": summary["total_reviews"],
                 "overall_average": overall_average,
                 "category_averages": category_averages,
                 "last_review_date": last_review_date
@@ -150,23 +157,49 @@ class ReviewAggregationService:
                 "error": str(e)
             }
 
-    async def aggregate_and_update_company(self, company_id: str) -> Dict[str, Any]:
+    async def _get_review_source_state(self, company_id: str) -> Optional[Dict[str, Any]]:
+        """
+        企業のレビューの状態（全件数・アクティブ件数・最終更新日時）を取得
+
+        Args:
+            company_id: 企業ID
+
+        Returns:
+            review_count・active_count・last_modified を持つ辞書。
+            レビューが0件の場合や取得に失敗した場合（aggregate は失敗時に空リストを返す）は None
+        """
+        states = await self.db.aggregate("reviews", [
+            {"$match": {"company_id": company_id}},
+            _SOURCE_STATE_GROUP_STAGE
+        ])
+        if not states:
+            return None
+
+        state = states[0]
+        return {
+            "review_count": state["review_count"],
+            "active_count": state["active_count"],
+            "last_modified": state.get("last_modified")
+        }
+
+    async def aggregate_and_update_company(
+        self, company_id: str, force: bool = False
+    ) -> Dict[str, Any]:
         """
         企業単位でレビューを集計し、Company.review_summary を更新
 
+        前回の集計以降にレビューが変わっていなければ、保存済みの review_summary を
+        そのまま返し、再集計と企業レコードの更新を行わない。
+        レビューの状態を取得できない場合（0件・取得失敗）は変更ありとみなして再集計する。
+
         Args:
             company_id: 企業ID
+            force: Trueの場合は変更判定を行わずに必ず再集計する（集計式・スキーマ変更後の再計算用）
 
         Returns:
             集計結果と更新ステータス
         """
         try:
-            # 集計処理を実行
-            aggregation_result = await self.aggregate_company_reviews(company_id)
-
-            if not aggregation_result["success"]:
-                return aggregation_result
-
             # ObjectIdに変換
             try:
                 company_oid = ObjectId(company_id)
@@ -178,12 +211,45 @@ class ReviewAggregationService:
                     "error": f"Invalid company_id format: {company_id}"
                 }
 
-            # review_summary データを構築
+            # 保存済みの集計元の状態と一致すれば、前回の集計結果をそのまま使う
+            if force:
+                source_state = await self._get_review_source_state(company_id)
+                stored_summary = None
+            else:
+                source_state, company = await asyncio.gather(
+                    self._get_review_source_state(company_id),
+                    self.db.find_one("companies", {"_id": company_oid})
+                )
+                stored_summary = (company or {}).get("review_summary")
+
+            if (
+                source_state is not None
+                and stored_summary
+                and stored_summary.get("source_state") == source_state
+            ):
+                return {
+                    "success": True,
+                    "company_id": company_id,
+                    "total_reviews": stored_summary["total_reviews"],
+                    "overall_average": stored_summary["overall_average"],
+                    "category_averages": stored_summary["category_averages"],
+                    "last_review_date": stored_summary["last_review_date"],
+                    "updated": False
+                }
+
+            # 集計処理を実行
+            aggregation_result = await self.aggregate_company_reviews(company_id)
+
+            if not aggregation_result["success"]:
+                return aggregation_result
+
+            # review_summary データを構築（次回の変更判定用に集計元の状態も保存する）
             review_summary = {
                 "total_reviews": aggregation_result["total_reviews"],
                 "overall_average": aggregation_result["overall_average"],
                 "category_averages": aggregation_result["category_averages"],
-                "last_review_date": aggregation_result["last_review_date"]
+                "last_review_date": aggregation_result["last_review_date"],
+                "source_state": source_state
             }
 
             # 企業レコードを更新
@@ -4,21 +4,38 @@
 ユーザーIDを匿名化表示（例：「ユーザーA」）に変換するサービス
 """
 import hashlib
-from typing import Optional, Dict, Any
+import string
+from typing import Optional, Dict, Any, Union
 from datetime import timezone
 from zoneinfo import ZoneInfo
 from src.models.review import Review
 
+# 表示用のタイムゾーン（レビューごとに取得し直さないよう、モジュール読み込み時に一度だけ取得する）
+_JST = ZoneInfo("Asia/Tokyo")
+
+# 26で割った余り -> 表示用のアルファベット（A-Z）
+_LETTERS = string.ascii_uppercase
+
+# プレビューモードでコメント本文の代わりに表示する文字列
+_MASKED_COMMENT = "***"
+
 
 class ReviewAnonymizationService:
     """ユーザーIDを匿名化するサービス"""
 
+    # 匿名化表示をキャッシュするユーザーIDの上限数（超えた場合はキャッシュを破棄して作り直す）
+    ANONYMIZED_CACHE_SIZE = 8192
+
     def __init__(self, salt: str = ""):
         """
         Args:
             salt: ハッシュ値のカスタマイズ用のソルト（オプション）
         """
         self.salt = salt
+        # ソルトはユーザーIDの後ろに連結するため、エンコード済みのバイト列を一度だけ用意しておく
+        self._salt_bytes = salt.encode('utf-8')
+        # ユーザーID -> 匿名化表示（ソルトはインスタンスごとに固定のため、ユーザーIDだけをキーにする）
+        self._anonymized_cache: Dict[str, str] = {}
 
     def anonymize_user_id(self, user_id: str) -> str:
         """
@@ -30,9 +47,15 @@ class ReviewAnonymizationService:
         Returns:
             匿名化表示（例：「ユーザーA」）
         """
-        hash_value = self._hash_user_id(user_id)
-        letter = self._hash_to_letter(hash_value)
-        return f"ユーザー{letter}"
+        anonymized = self._anonymized_cache.get(user_id)
+        if anonymized is None:
+            letter = self._digest_to_letter(self._digest_user_id(user_id))
+            anonymized = f"ユーザー{letter}"
+
+            if len(self._anonymized_cache) >= self.ANONYMIZED_CACHE_SIZE:
+                self._anonymized_cache.clear()
+            self._anonymized_cache[user_id] = anonymized
+        return anonymized
 
     def anonymize_review(self, review: Review, preview_mode: bool = False) -> Dict[str, Any]:
         """
@@ -57,28 +80,18 @@ class ReviewAnonymizationService:
                 "display": review.employment_period.get_display_string()
             }
 
-        # コメントの処理（プレビューモードの場合はマスキング）
-        def mask_comments(comments: Optional[Dict[str, Optional[str]]]) -> Optional[Dict[str, Optional[str]]]:
-            """コメントをマスキングする（プレビューモード用）"""
-            if comments is None:
-                return None
-            return {
-                key: "***" if value is not None else None
-                for key, value in comments.items()
-            }
-
-        comments = mask_comments(review.comments) if preview_mode else review.comments
-        comments_ja = mask_comments(review.comments_ja) if preview_mode and review.comments_ja else review.comments_ja
-        comments_zh = mask_comments(review.comments_zh) if preview_mode and review.comments_zh else review.comments_zh
-        comments_en = mask_comments(review.comments_en) if preview_mode and review.comments_en else review.comments_en
+        # コメントの処理（プレビューモードの場合はマスキング、それ以外は元の辞書をそのまま使う）
+        comments = self._mask_or_pass(review.comments, preview_mode)
+        comments_ja = self._mask_or_pass(review.comments_ja, preview_mode)
+        comments_zh = self._mask_or_pass(review.comments_zh, preview_mode)
+        comments_en = self._mask_or_pass(review.comments_en, preview_mode)
 
         # タイムゾーン変換: UTC → JST (Good Pattern - Timezone-Aware Datetime)
-        jst = ZoneInfo("Asia/Tokyo")
-        created_at_jst = review.created_at.astimezone(jst) if review.created_at else None
-        updated_at_jst = review.updated_at.astimezone(jst) if review.updated_at else None
+        created_at_jst = review.created_at.astimezone(_JST) if review.created_at else None
+        updated_at_jst = review.updated_at.astimezone(_JST) if review.updated_at else None
 
-        # 匿名化されたレビューデータを構築
-        anonymized_review = {
+        # 匿名化されたレビューデータを構築（一つの辞書リテラルで全キーをまとめて生成する）
+        return {
             "id": review.id,
             "company_id": review.company_id,
             "anonymized_user": anonymized_user,
@@ -99,21 +112,74 @@ class ReviewAnonymizationService:
             "comments_en": comments_en
         }
 
-        return anonymized_review
+    @staticmethod
+    def _mask_or_pass(
+        comments: Optional[Dict[str, Optional[str]]], preview_mode: bool
+    ) -> Optional[Dict[str, Optional[str]]]:
+        """
+        プレビューモードの場合のみコメントをマスキングする
+
+        Args:
+            comments: コメントの辞書
+            preview_mode: プレビューモード
+
+        Returns:
+            マスキングしたコメント（プレビューモードでない場合や空の場合は元の辞書）
+        """
+        if not preview_mode or not comments:
+            return comments
+        # 未回答（None）の項目がなければ、全キーをまとめてマスキングする
+        if None not in comments.values():
+            return dict.fromkeys(comments, _MASKED_COMMENT)
+        return {
+            key: _MASKED_COMMENT if value is not None else None
+            for key, value in comments.items()
+        }
 
-    def _hash_user_id(self, user_id: str) -> str:
+    def _digest_user_id(self, user_id: Union[str, bytes]) -> bytes:
+        """
+        ユーザーIDからSHA-256ダイジェストを生成
+
+        Args:
+            user_id: ユーザーID（UTF-8エンコード済みのバイト列も可）
+
+        Returns:
+            32バイトのダイジェスト
+        """
+        # バイト列はエンコード済みとみなし、そのままハッシュに渡す
+        if not isinstance(user_id, (bytes, bytearray)):
+            user_id = user_id.encode('utf-8')
+
+        # user_id + salt をUTF-8でエンコードした値のハッシュ（文字列の連結は行わない）
+        hash_object = hashlib.sha256(user_id)
+        hash_object.update(self._salt_bytes)
+        return hash_object.digest()
+
+    def _hash_user_id(self, user_id: Union[str, bytes]) -> str:
         """
         ユーザーIDからSHA-256ハッシュ値を生成
 
         Args:
-            user_id: ユーザーID
+            user_id: ユーザーID（UTF-8エンコード済みのバイト列も可）
 
         Returns:
             64文字の16進数文字列
         """
-        salted_user_id = user_id + self.salt
-        hash_object = hashlib.sha256(salted_user_id.encode('utf-8'))
-        return hash_object.hexdigest()
+        return self._digest_user_id(user_id).hex()
+
+    @staticmethod
+    def _digest_to_letter(digest: bytes) -> str:
+        """
+        ダイジェストをA-Zの1文字に変換（_hash_to_letter と同じ結果を16進数文字列を介さずに求める）
+
+        Args:
+            digest: SHA-256ダイジェスト
+
+        Returns:
+            A-Zの1文字
+        """
+        # 先頭4バイト（16進数の最初の8文字に相当）を26で割った余り
+        return _LETTERS[int.from_bytes(digest[:4], 'big') % 26]
 
     def _hash_to_letter(self, hash_value: str) -> str:
         """
@@ -141,6 +207,6 @@ class ReviewAnonymizationService:
         remainder = decimal_value % 26
 
         # A-Zのアルファベットに変換
-        letter = chr(ord('A') + remainder)
+        letter = _LETTERS[remainder]
 
         return letter
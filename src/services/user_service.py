@@ -4,7 +4,7 @@
 import re
 import bcrypt
 import logging
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from datetime import datetime, timedelta
 from ..models.user import User, UserType
 from ..utils.result import Result
@@ -28,9 +28,16 @@ class AuthenticationError(Exception):
 class UserService:
     """ユーザー管理サービス"""
     
-    def __init__(self, db_service=None):
+    def __init__(self, db_service=None, on_user_changed: Optional[Callable[[str], None]] = None):
         self.db_service = db_service
+        # プロフィール・企業情報・有効状態の更新後に user_id を渡して呼び出す（キャッシュ破棄用）
+        self.on_user_changed = on_user_changed
     
+    def _notify_user_changed(self, user_id: str) -> None:
+        """ユーザー情報の変更を通知"""
+        if self.on_user_changed is not None:
+            self.on_user_changed(user_id)
+
     def validate_registration_data(self, user_data: dict) -> Result[bool, ValidationError]:
         """ユーザー登録データの検証"""
         errors = {}
@@ -238,6 +245,7 @@ class UserService:
 
             success = await self.db_service.update_one('users', {'_id': user_id}, update_data)
             if success:
+                self._notify_user_changed(user_id)
                 return Result.success(True)
             else:
                 return Result.failure(ValidationError({'update': ['Profile update failed']}))
@@ -324,6 +332,7 @@ class UserService:
 
             success = await self.db_service.update_one('users', {'_id': user_id}, update_data)
             if success:
+                self._notify_user_changed(user_id)
                 return Result.success(True)
             else:
                 return Result.failure(ValidationError({'update': ['Company info update failed']}))
@@ -401,7 +410,11 @@ class UserService:
                     'update': {'$set': {'is_active': is_active, 'updated_at': datetime.utcnow()}}
                 })
 
-            return await self.db_service.bulk_update('users', bulk_updates)
+            updated_count = await self.db_service.bulk_update('users', bulk_updates)
+            if updated_count:
+                for user_id in user_ids:
+                    self._notify_user_changed(user_id)
+            return updated_count
 
         except Exception as e:
             logger.error(f"bulk_update_user_status エラー: {e}")
@@ -19,6 +19,7 @@ sys.path.insert(0, str(project_root))
 
 from src.database import DatabaseService
 from src.services.company_service import CompanyService
+from src.services.review_aggregation_service import ReviewAggregationService  # noqa: E402
 
 # ロギング設定
 logging.basicConfig(
@@ -79,6 +80,15 @@ async def create_review_indexes():
             logger.error("✗ レビュー集計データ用のインデックス作成に失敗しました")
             return False
 
+        # レビュー集計クエリ用のインデックスを作成
+        logger.info("\nレビュー集計クエリ用のインデックスを作成中...")
+        aggregation_service = ReviewAggregationService(db_service)
+        if await aggregation_service.create_review_aggregation_indexes():
+            logger.info("✓ レビュー集計クエリ用のインデックス作成に成功しました")
+        else:
+            logger.error("✗ レビュー集計クエリ用のインデックス作成に失敗しました")
+            return False
+
         logger.info("\n" + "=" * 60)
         logger.info("レビュー集計データ用インデックス作成スクリプトが完了しました")
         logger.info("=" * 60)
@@ -127,6 +137,15 @@ async def verify_indexes():
                 logger.error(f"  ✗ {required_index} - 不足")
                 all_present = False
 
+        # レビュー集計クエリ用のインデックス
+        review_indexes = await db_service.db['reviews'].index_information()
+        required_review_index = 'company_id_1_is_active_1_created_at_-1'
+        if required_review_index in review_indexes:
+            logger.info(f"  ✓ reviews.{required_review_index} - 存在")
+        else:
+            logger.error(f"  ✗ reviews.{required_review_index} - 不足")
+            all_present = False
+
         if all_present:
             logger.info("\n✓ すべての必要なインデックスが存在します")
             logger.info("=" * 60)
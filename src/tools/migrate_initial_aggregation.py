@@ -86,7 +86,10 @@ class InitialAggregationMigrator:
             try:
                 logger.info("[%d/%d] Aggregating company %s...", i, len(company_ids), company_id)
 
-                result = await self.aggregation_service.aggregate_and_update_company(company_id)
+                # 集計式・スキーマ変更後の再計算にも使うため、保存済みの集計結果は再利用しない
+                result = await self.aggregation_service.aggregate_and_update_company(
+                    company_id, force=True
+                )
 
                 if result.get("success"):
                     successful_count += 1
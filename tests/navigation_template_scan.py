@@ -0,0 +1,155 @@
+"""
+ナビゲーション関連テスト用のテンプレート走査ヘルパー
+
+test_navigation_integration.py と test_navigation_cleanup.py から利用する。
+"""
+import functools
+import re
+
+# ナビゲーション関連テストが参照するテンプレート
+NAVIGATION_TEMPLATES = (
+    'templates/base.html',
+    'templates/companies/detail.html',
+    'templates/reviews/list.html',
+    'templates/review_detail.html',
+    'templates/category_review_list.html',
+)
+
+# カテゴリ別レビュー一覧の対象カテゴリ
+CATEGORIES = (
+    'recommendation',
+    'foreign_support',
+    'company_culture',
+    'employee_relations',
+    'evaluation_system',
+    'promotion_treatment',
+)
+
+# 有無・件数だけを見るリテラル（名前 -> バイト列）。1つの選択パターンで1回だけ走査する
+_LITERALS = {
+    'href_home': b'href="/"',
+    'href_companies': b'href="/companies"',
+    'href_review': b'href="/review"',
+    'href_jobs': b'href="/jobs"',
+    'href_talents': b'href="/talents"',
+    'nav_text_home': '<span class="nav-text">ホーム</span>'.encode(),
+    'nav_text_companies': '<span class="nav-text">企業一覧</span>'.encode(),
+    'nav_text_jobs': '<span class="nav-text">求人情報</span>'.encode(),
+    'nav_text_talents': '<span class="nav-text">人材情報</span>'.encode(),
+    'detail_text': '詳細を見る'.encode(),
+}
+_LITERAL_NAMES = {needle: name for name, needle in _LITERALS.items()}
+_LITERAL_PATTERN = re.compile(b'|'.join(re.escape(needle) for needle in _LITERALS.values()))
+
+# カテゴリごとに個別に検索する（1つの選択パターンでは同じ行の2つ目以降のカテゴリを取りこぼすため）
+_CATEGORY_LINKS = {
+    category: re.compile(rb'/companies/.*?/reviews/by-category/' + category.encode())
+    for category in CATEGORIES
+}
+_TEMPLATED_CATEGORY_LINKS = {
+    category: re.compile(rb'/companies/\{\{.*?\}\}/reviews/by-category/' + category.encode())
+    for category in CATEGORIES
+}
+_ANY_CATEGORY_LINK = re.compile(rb'/companies/.*?/reviews/by-category/.*?[\'"]')
+_REVIEW_DETAIL_LINK = re.compile(rb'/companies/.*?/reviews/.*?[\'"]')
+_COMPANY_LINK = re.compile(rb'/companies/.*?[\'"]')
+
+# 内部リンク（/companies/, /reviews/）のうち target="_blank" を持つものだけにマッチ
+_INTERNAL_LINK_WITH_BLANK_TARGET = re.compile(
+    rb'<a[^>]*href=[\'"]/(?:companies|reviews)/[^>]*target=[\'"]_blank[\'"][^>]*>',
+    re.IGNORECASE
+)
+
+_RESPONSIVE = re.compile(
+    rb'@media.*?(?:max-width|min-width).*?768px'
+    rb'|class=[\'"].*?responsive.*?[\'"]'
+    rb'|class=[\'"].*?mobile.*?[\'"]'
+    rb'|class=[\'"].*?(?:col-|row-).*?[\'"]',  # Bootstrap grid
+    re.IGNORECASE
+)
+
+_BREADCRUMB = re.compile(
+    rb'breadcrumb'
+    rb'|' + 'ホーム'.encode() + rb'.*?' + '企業一覧'.encode() +
+    rb'|nav.*?aria-label=[\'"]breadcrumb[\'"]',
+    re.IGNORECASE
+)
+
+# 「戻る」または企業名リンク
+_BACK_LINK = re.compile(
+    '戻る'.encode() +
+    rb'|' + '企業ページ'.encode() +
+    rb'|class=[\'"]company.*?name[\'"]',
+    re.IGNORECASE
+)
+
+# ホバー効果の存在確認（CSS内またはstyle属性）
+_HOVER_EFFECT = re.compile(rb':hover|transition|opacity|transform|box-shadow', re.IGNORECASE)
+
+# 閉じタグ直後の空白 + 閉じタグ（match 位置から線形に判定）
+_TRAILING_CLOSING_DIV = re.compile(rb'\s*</div>')
+
+
+def _section_until_double_closing_div(data, marker):
+    """marker から最初の「</div> 空白 </div>」までを切り出す
+
+    DOTALL 正規表現のバックトラックを避けるため、find と線形の照合で探す。
+    """
+    start = data.find(marker)
+    if start == -1:
+        return None
+
+    pos = start
+    while True:
+        end = data.find(b'</div>', pos)
+        if end == -1:
+            return None
+        pos = end + len(b'</div>')
+        trailing = _TRAILING_CLOSING_DIV.match(data, pos)
+        if trailing:
+            return data[start:trailing.end()]
+
+
+def _scan_all(data):
+    """テンプレート1件分のバイト列から、ナビゲーションテストが参照する全シグナルを収集する"""
+    literal_counts = dict.fromkeys(_LITERALS, 0)
+    for match in _LITERAL_PATTERN.finditer(data):
+        literal_counts[_LITERAL_NAMES[match.group(0)]] += 1
+
+    blank_target_link = _INTERNAL_LINK_WITH_BLANK_TARGET.search(data)
+    category_section = _section_until_double_closing_div(data, b'category-reviews-section')
+
+    return {
+        'literal_counts': literal_counts,
+        # リンクが見つからなかったカテゴリ（CATEGORIES の順）
+        'missing_categories': [c for c in CATEGORIES if _CATEGORY_LINKS[c].search(data) is None],
+        # /companies/{{ ... }}/reviews/by-category/ 形式のリンクが見つからなかったカテゴリ
+        'missing_templated_categories': [
+            c for c in CATEGORIES if _TEMPLATED_CATEGORY_LINKS[c].search(data) is None
+        ],
+        'category_link_count': len(_ANY_CATEGORY_LINK.findall(data)),
+        'has_review_detail_link': _REVIEW_DETAIL_LINK.search(data) is not None,
+        'has_company_link': _COMPANY_LINK.search(data) is not None,
+        'has_back_link': _BACK_LINK.search(data) is not None,
+        'blank_target_internal_link': blank_target_link.group(0) if blank_target_link else None,
+        'is_responsive': _RESPONSIVE.search(data) is not None,
+        'has_breadcrumb': _BREADCRUMB.search(data) is not None,
+        # カテゴリボタンセクションが無い場合は None
+        'category_section_has_hover': (
+            None if category_section is None
+            else _HOVER_EFFECT.search(category_section) is not None
+        ),
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def scan_navigation_templates():
+    """ナビゲーション関連テンプレートを一度だけ読み込み・走査した結果
+
+    テンプレートのパス -> シグナルの辞書を返す。
+    """
+    result = {}
+    for path in NAVIGATION_TEMPLATES:
+        with open(path, 'rb') as f:
+            result[path] = _scan_all(f.read())
+    return result
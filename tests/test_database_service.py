@@ -246,4 +246,24 @@ class TestDatabaseServiceIndexing:
 
         indexes = await db_service.list_indexes("test_collection")
         assert len(indexes) == 2
-        assert indexes[1]["unique"] is True
\ No newline at end of file
+        assert indexes[1]["unique"] is True
+
+
+class TestDatabaseServiceCollectionManagement:
+    """コレクション管理のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_drop_collection(self):
+        """コレクション削除"""
+        db_service = DatabaseService()
+        db_service.client = Mock()
+        db_service.db = Mock()
+
+        mock_collection = AsyncMock()
+        mock_collection.drop = AsyncMock(return_value=None)
+        db_service.db.__getitem__ = Mock(return_value=mock_collection)
+
+        await db_service.drop_collection("test_collection")
+
+        db_service.db.__getitem__.assert_called_once_with("test_collection")
+        mock_collection.drop.assert_awaited_once()
@@ -3,8 +3,11 @@ MongoDB でのデータ構造テスト
 タスク 1.3: MongoDB でデータモデル拡張が正しく動作するかテスト
 
 注意: このテストは MongoDB が起動している必要があります
+      （環境変数 RUN_MONGO_TESTS=1 を設定した場合のみ実行）
 """
+import os
 import pytest
+import pytest_asyncio
 import asyncio
 from datetime import datetime, timezone
 from bson import ObjectId
@@ -13,32 +16,47 @@ from src.models.review import Review, EmploymentStatus
 from src.models.user import User, UserType
 
 
+@pytest.fixture(scope="session")
+def event_loop():
+    """セッション共有の MongoDB 接続と同じイベントループで全テストを実行する"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def mongo_conn():
+    """MongoDB 接続をセッション中に一度だけ確立する"""
+    db = DatabaseService()
+    try:
+        await db.connect()
+    except Exception as e:
+        pytest.skip(f"MongoDB に接続できません: {e}")
+
+    yield db
+
+    await db.disconnect()
+
+
 @pytest.mark.skipif(
-    True,  # MongoDB が起動していない場合はスキップ
-    reason="MongoDB が起動している場合のみ実行"
+    not os.environ.get("RUN_MONGO_TESTS"),  # MongoDB が起動していない場合はスキップ
+    reason="MongoDB が起動している場合のみ実行（RUN_MONGO_TESTS=1）"
 )
 class TestMongoDBDataStructure:
     """MongoDB でのデータ構造テスト"""
 
-    @pytest.fixture
-    async def db_service(self):
-        """テスト用データベースサービス"""
-        db = DatabaseService()
-        try:
-            await db.connect()
-        except Exception as e:
-            pytest.skip(f"MongoDB に接続できません: {e}")
-
+    @pytest_asyncio.fixture
+    async def db_service(self, mongo_conn):
+        """テスト用データベースサービス（接続は共有し、コレクションのみクリーンアップ）"""
         # テストコレクションをクリーンアップ
-        await db.delete_many("reviews_structure_test", {})
-        await db.delete_many("users_structure_test", {})
+        await mongo_conn.drop_collection("reviews_structure_test")
+        await mongo_conn.drop_collection("users_structure_test")
 
-        yield db
+        yield mongo_conn
 
         # クリーンアップ
-        await db.delete_many("reviews_structure_test", {})
-        await db.delete_many("users_structure_test", {})
-        await db.disconnect()
+        await mongo_conn.drop_collection("reviews_structure_test")
+        await mongo_conn.drop_collection("users_structure_test")
 
     @pytest.mark.asyncio
     async def test_review_multilingual_save_and_load(self, db_service):
@@ -61,13 +79,13 @@ class TestMongoDBDataStructure:
         }
 
         # MongoDB に保存
-        review_id = await db_service.create("reviews_structure_test", review_data)
-        assert review_id is not None
+        review_oid = ObjectId(await db_service.create("reviews_structure_test", review_data))
+        assert review_oid is not None
 
         # MongoDB から読み込み
         loaded_data = await db_service.find_one(
             "reviews_structure_test",
-            {"_id": ObjectId(review_id)}
+            {"_id": review_oid}
         )
 
         # データ構造を検証
@@ -100,13 +118,13 @@ class TestMongoDBDataStructure:
         }
 
         # MongoDB に保存
-        user_id = await db_service.create("users_structure_test", user_data)
-        assert user_id is not None
+        user_oid = ObjectId(await db_service.create("users_structure_test", user_data))
+        assert user_oid is not None
 
         # MongoDB から読み込み
         loaded_data = await db_service.find_one(
             "users_structure_test",
-            {"_id": ObjectId(user_id)}
+            {"_id": user_oid}
         )
 
         # データ構造を検証
@@ -166,25 +184,19 @@ class TestMongoDBDataStructure:
 
         await db_service.bulk_insert("reviews_structure_test", reviews_data)
 
-        # 言語別にクエリ
-        ja_reviews = await db_service.find_many(
-            "reviews_structure_test",
-            {"language": "ja"}
+        # 言語別にクエリ（互いに独立しているため並行実行）
+        ja_reviews, en_reviews, zh_reviews = await asyncio.gather(
+            db_service.find_many("reviews_structure_test", {"language": "ja"}),
+            db_service.find_many("reviews_structure_test", {"language": "en"}),
+            db_service.find_many("reviews_structure_test", {"language": "zh"}),
         )
+
         assert len(ja_reviews) == 1
         assert ja_reviews[0]["language"] == "ja"
 
-        en_reviews = await db_service.find_many(
-            "reviews_structure_test",
-            {"language": "en"}
-        )
         assert len(en_reviews) == 1
         assert en_reviews[0]["language"] == "en"
 
-        zh_reviews = await db_service.find_many(
-            "reviews_structure_test",
-            {"language": "zh"}
-        )
         assert len(zh_reviews) == 1
         assert zh_reviews[0]["language"] == "zh"
 
@@ -207,12 +219,12 @@ class TestMongoDBDataStructure:
             # comments_ja, comments_zh は含まない
         }
 
-        review_id = await db_service.create("reviews_structure_test", review_data)
+        review_oid = ObjectId(await db_service.create("reviews_structure_test", review_data))
 
         # 読み込み
         loaded_data = await db_service.find_one(
             "reviews_structure_test",
-            {"_id": ObjectId(review_id)}
+            {"_id": review_oid}
         )
 
         assert loaded_data["language"] == "en"
@@ -239,12 +251,12 @@ class TestMongoDBDataStructure:
             # last_review_posted_at は含まない
         }
 
-        user_id = await db_service.create("users_structure_test", user_data)
+        user_oid = ObjectId(await db_service.create("users_structure_test", user_data))
 
         # 読み込み
         loaded_data = await db_service.find_one(
             "users_structure_test",
-            {"_id": ObjectId(user_id)}
+            {"_id": user_oid}
         )
 
         assert "last_review_posted_at" not in loaded_data
@@ -256,83 +268,72 @@ class TestMongoDBDataStructure:
 
 
 # MongoDB なしでも実行できる簡易テスト
+@pytest.fixture(scope="module")
+def now():
+    """モジュール共通の現在時刻"""
+    return datetime.now(timezone.utc)
+
+
+@pytest.fixture(scope="module")
+def sample_review(now):
+    """多言語フィールドを持つ Review（モジュール内で一度だけ生成）"""
+    return Review(
+        id="test_id",
+        company_id="company_123",
+        user_id="user_456",
+        employment_status=EmploymentStatus.CURRENT,
+        ratings={"recommendation": 4},
+        comments={"recommendation": "良い"},
+        individual_average=4.0,
+        answered_count=1,
+        created_at=now,
+        updated_at=now,
+        language="ja",
+        comments_en={"recommendation": "Good"},
+        comments_zh={"recommendation": "好"}
+    )
+
+
+@pytest.fixture(scope="module")
+def sample_user(now):
+    """last_review_posted_at を持つ User（モジュール内で一度だけ生成）"""
+    return User(
+        id="test_id",
+        email="test@example.com",
+        name="Test User",
+        user_type=UserType.JOB_SEEKER,
+        password_hash="hashed",
+        last_review_posted_at=now
+    )
+
+
 class TestDataModelStructure:
     """データモデルの構造テスト（MongoDB なし）"""
 
-    def test_review_model_has_multilingual_fields(self):
+    def test_review_model_has_multilingual_fields(self, sample_review):
         """Review モデルが多言語フィールドを持つ"""
-        review = Review(
-            id="test_id",
-            company_id="company_123",
-            user_id="user_456",
-            employment_status=EmploymentStatus.CURRENT,
-            ratings={"recommendation": 4},
-            comments={"recommendation": "良い"},
-            individual_average=4.0,
-            answered_count=1,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc),
-            language="ja",
-            comments_en={"recommendation": "Good"},
-            comments_zh={"recommendation": "好"}
-        )
-
-        assert hasattr(review, 'language')
-        assert hasattr(review, 'comments_en')
-        assert hasattr(review, 'comments_zh')
-        assert hasattr(review, 'comments_ja')
+        assert hasattr(sample_review, 'language')
+        assert hasattr(sample_review, 'comments_en')
+        assert hasattr(sample_review, 'comments_zh')
+        assert hasattr(sample_review, 'comments_ja')
 
-    def test_user_model_has_last_review_posted_at_field(self):
+    def test_user_model_has_last_review_posted_at_field(self, sample_user):
         """User モデルが last_review_posted_at フィールドを持つ"""
-        user = User(
-            id="test_id",
-            email="test@example.com",
-            name="Test User",
-            user_type=UserType.JOB_SEEKER,
-            password_hash="hashed",
-            last_review_posted_at=datetime.now(timezone.utc)
-        )
+        assert hasattr(sample_user, 'last_review_posted_at')
+        assert hasattr(sample_user, 'update_last_review_posted_at')
+        assert hasattr(sample_user, 'has_review_access')
 
-        assert hasattr(user, 'last_review_posted_at')
-        assert hasattr(user, 'update_last_review_posted_at')
-        assert hasattr(user, 'has_review_access')
-
-    def test_review_to_dict_includes_new_fields(self):
+    def test_review_to_dict_includes_new_fields(self, sample_review):
         """Review.to_dict() が新規フィールドを含む"""
-        review = Review(
-            id="test_id",
-            company_id="company_123",
-            user_id="user_456",
-            employment_status=EmploymentStatus.CURRENT,
-            ratings={"recommendation": 4},
-            comments={"recommendation": "良い"},
-            individual_average=4.0,
-            answered_count=1,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc),
-            language="ja",
-            comments_en={"recommendation": "Good"}
-        )
-
-        data = review.to_dict()
+        data = sample_review.to_dict()
 
         assert "language" in data
         assert "comments_en" in data
         assert data["language"] == "ja"
 
-    def test_user_to_dict_includes_last_review_posted_at(self):
+    def test_user_to_dict_includes_last_review_posted_at(self, sample_user, now):
         """User.to_dict() が last_review_posted_at を含む"""
-        now = datetime.now(timezone.utc)
-        user = User(
-            id="test_id",
-            email="test@example.com",
-            name="Test User",
-            user_type=UserType.JOB_SEEKER,
-            password_hash="hashed",
-            last_review_posted_at=now
-        )
-
-        data = user.to_dict()
+        data = sample_user.to_dict()
 
         assert "last_review_posted_at" in data
         assert data["last_review_posted_at"] == now.isoformat()
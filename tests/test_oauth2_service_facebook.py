@@ -4,11 +4,22 @@ Task 4.1: Facebook OAuth2.0認証フローの構築
 """
 import pytest
 import os
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch
+from urllib.parse import quote
 import requests
 from src.services.oauth2_service import OAuth2Service
 
 
+REDIRECT_URI = "http://localhost:8202/auth/facebook/callback"
+REDIRECT_URI_ENC = quote(REDIRECT_URI, safe='')
+
+
+def _resp(json_data):
+    """Minimal stand-in for requests.Response (only raise_for_status/json are used)"""
+    return SimpleNamespace(raise_for_status=lambda: None, json=lambda: json_data)
+
+
 class TestOAuth2ServiceFacebook:
     """Test OAuth2Service Facebook integration"""
 
@@ -28,12 +39,11 @@ class TestOAuth2ServiceFacebook:
         """Test Facebook authorization URL generation"""
         # RED: テスト先行 - Facebook認証URL生成がまだ実装されていない
 
-        redirect_uri = "http://localhost:8202/auth/facebook/callback"
         state = "test_state_123"
 
         result = oauth2_service.get_authorization_url(
             provider='facebook',
-            redirect_uri=redirect_uri,
+            redirect_uri=REDIRECT_URI,
             state=state
         )
 
@@ -43,7 +53,7 @@ class TestOAuth2ServiceFacebook:
         # Verify URL contains required Facebook OAuth parameters
         assert 'https://www.facebook.com/v18.0/dialog/oauth' in auth_url
         assert 'client_id=test_facebook_client_id' in auth_url
-        assert 'redirect_uri=http%3A%2F%2Flocalhost%3A8202%2Fauth%2Ffacebook%2Fcallback' in auth_url  # URL encoded
+        assert f'redirect_uri={REDIRECT_URI_ENC}' in auth_url  # URL encoded
         assert 'scope=email' in auth_url
         assert 'response_type=code' in auth_url
         assert f'state={state}' in auth_url
@@ -55,29 +65,23 @@ class TestOAuth2ServiceFacebook:
         # RED: テスト先行 - Facebook認証コード交換がまだ実装されていない
 
         # Mock token exchange response
-        mock_token_response = MagicMock()
-        mock_token_response.raise_for_status.return_value = None
-        mock_token_response.json.return_value = {
+        mock_post.return_value = _resp({
             'access_token': 'facebook_access_token_123',
             'token_type': 'bearer'
-        }
-        mock_post.return_value = mock_token_response
+        })
 
         # Mock user info response
-        mock_userinfo_response = MagicMock()
-        mock_userinfo_response.raise_for_status.return_value = None
-        mock_userinfo_response.json.return_value = {
+        mock_get.return_value = _resp({
             'id': 'facebook_user_123',
             'name': 'Facebook Test User',
             'email': 'user@facebook.com'
-        }
-        mock_get.return_value = mock_userinfo_response
+        })
 
         # Execute code exchange
         result = oauth2_service.exchange_authorization_code(
             provider='facebook',
             code='test_facebook_code',
-            redirect_uri='http://localhost:8202/auth/facebook/callback'
+            redirect_uri=REDIRECT_URI
         )
 
         assert result.is_success
@@ -128,7 +132,7 @@ class TestOAuth2ServiceFacebook:
             result = oauth2_service.exchange_authorization_code(
                 provider='facebook',
                 code='invalid_code',
-                redirect_uri='http://localhost:8202/auth/facebook/callback'
+                redirect_uri=REDIRECT_URI
             )
 
             assert not result.is_success
@@ -140,7 +144,7 @@ class TestOAuth2ServiceFacebook:
 
         result = oauth2_service.get_authorization_url(
             provider='facebook',
-            redirect_uri='http://localhost:8202/auth/facebook/callback',
+            redirect_uri=REDIRECT_URI,
             state='test_state'
         )
 
@@ -157,27 +161,21 @@ class TestOAuth2ServiceFacebook:
         # RED: テスト先行 - メールアドレスなしFacebookユーザー処理がまだ実装されていない
 
         # Mock successful token exchange
-        mock_token_response = MagicMock()
-        mock_token_response.raise_for_status.return_value = None
-        mock_token_response.json.return_value = {
+        mock_post.return_value = _resp({
             'access_token': 'facebook_access_token_123'
-        }
-        mock_post.return_value = mock_token_response
+        })
 
         # Mock user info response without email
-        mock_userinfo_response = MagicMock()
-        mock_userinfo_response.raise_for_status.return_value = None
-        mock_userinfo_response.json.return_value = {
+        mock_get.return_value = _resp({
             'id': 'facebook_user_123',
             'name': 'Facebook Test User'
             # No email field
-        }
-        mock_get.return_value = mock_userinfo_response
+        })
 
         result = oauth2_service.exchange_authorization_code(
             provider='facebook',
             code='test_code',
-            redirect_uri='http://localhost:8202/auth/facebook/callback'
+            redirect_uri=REDIRECT_URI
         )
 
         assert not result.is_success
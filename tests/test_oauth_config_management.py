@@ -4,18 +4,20 @@ Task 1.2: 環境設定とコンフィギュレーション管理の実装
 """
 import pytest
 import os
+from types import MappingProxyType
 from unittest.mock import patch, mock_open
+from dotenv import dotenv_values
 from src.config import OAuthConfig
-from src.services.oauth_config_service import OAuthConfigService
+from src.services.oauth_config_service import OAuthConfigService, _parse_dotenv
 
 
 class TestOAuthConfigManagement:
     """Test OAuth configuration management"""
 
-    @pytest.fixture
+    @pytest.fixture(scope='session')
     def mock_env_vars(self):
-        """Mock environment variables for testing"""
-        env_vars = {
+        """Mock environment variables for testing (read-only, shared across the session)"""
+        return MappingProxyType({
             # Google OAuth settings
             'GOOGLE_CLIENT_ID': 'test_google_client_id',
             'GOOGLE_CLIENT_SECRET': 'test_google_client_secret',
@@ -39,74 +41,114 @@ class TestOAuthConfigManagement:
             # Encryption settings
             'EMAIL_ENCRYPTION_KEY': 'test_encryption_key_32_bytes_long!',
             'EMAIL_HASH_SALT': 'test_salt_for_hashing'
-        }
-        return env_vars
+        })
+
+    @pytest.fixture(scope='module')
+    def oauth_env(self, mock_env_vars):
+        """Environment populated from mock_env_vars for the whole module"""
+        with pytest.MonkeyPatch.context() as mp:
+            for key, value in mock_env_vars.items():
+                mp.setenv(key, value)
+            yield
 
     @pytest.fixture
-    def oauth_config_service(self, mock_env_vars):
-        """OAuth config service fixture"""
-        with patch.dict(os.environ, mock_env_vars):
-            return OAuthConfigService()
+    def empty_rules_env(self, mock_env_vars):
+        """Complete environment with empty access control rules"""
+        env = dict(mock_env_vars)
+        env['ACCESS_CONTROL_RULES'] = ''
+        return env
+
+    @pytest.fixture(scope='module')
+    def oauth_config_service(self, oauth_env):
+        """OAuth config service fixture (shared within the module; do not refresh)"""
+        return OAuthConfigService()
 
-    def test_oauth_config_class_initialization(self, mock_env_vars):
+    @pytest.fixture
+    def fresh_oauth_config_service(self, oauth_env):
+        """Independent OAuth config service for tests that refresh or reload configuration"""
+        return OAuthConfigService()
+
+    def test_oauth_config_class_initialization(self, oauth_env):
         """Test OAuthConfig class initializes with environment variables"""
         # RED: テスト先行 - OAuthConfigクラスがまだ実装されていない
 
-        with patch.dict(os.environ, mock_env_vars):
-            config = OAuthConfig()
+        config = OAuthConfig()
 
-            # Google OAuth settings
-            assert config.GOOGLE_CLIENT_ID == 'test_google_client_id'
-            assert config.GOOGLE_CLIENT_SECRET == 'test_google_client_secret'
-            assert config.GOOGLE_REDIRECT_URI == 'https://localhost:8202/auth/google/callback'
+        # Google OAuth settings
+        assert config.GOOGLE_CLIENT_ID == 'test_google_client_id'
+        assert config.GOOGLE_CLIENT_SECRET == 'test_google_client_secret'
+        assert config.GOOGLE_REDIRECT_URI == 'https://localhost:8202/auth/google/callback'
 
-            # Facebook OAuth settings
-            assert config.FACEBOOK_APP_ID == 'test_facebook_app_id'
-            assert config.FACEBOOK_APP_SECRET == 'test_facebook_app_secret'
-            assert config.FACEBOOK_REDIRECT_URI == 'https://localhost:8202/auth/facebook/callback'
+        # Facebook OAuth settings
+        assert config.FACEBOOK_APP_ID == 'test_facebook_app_id'
+        assert config.FACEBOOK_APP_SECRET == 'test_facebook_app_secret'
+        assert config.FACEBOOK_REDIRECT_URI == 'https://localhost:8202/auth/facebook/callback'
 
-    def test_smtp_config_validation(self, mock_env_vars):
+    def test_smtp_config_validation(self, oauth_env):
         """Test SMTP configuration validation"""
         # RED: テスト先行 - SMTP設定バリデーションがまだ実装されていない
 
+        config = OAuthConfig()
+
+        assert config.SMTP_HOST == 'smtp.gmail.com'
+        assert config.SMTP_PORT == 587  # 数値に変換されることを確認
+        assert config.SMTP_USERNAME == 'test@example.com'
+        assert config.SMTP_PASSWORD == 'test_password'
+        assert config.SMTP_USE_TLS is True  # ブール値に変換されることを確認
+
+    @pytest.mark.parametrize('raw_value,expected', [
+        ('True', True), ('1', True), ('yes', True), ('ON', True),
+        ('False', False), ('0', False), ('', False)
+    ])
+    def test_smtp_use_tls_boolean_parsing(self, mock_env_vars, raw_value, expected):
+        """Test SMTP_USE_TLS accepts common truthy spellings"""
+        env = dict(mock_env_vars)
+        env['SMTP_USE_TLS'] = raw_value
+
+        with patch.dict(os.environ, env):
+            assert OAuthConfig().SMTP_USE_TLS is expected
+
+    def test_oauth_config_reflects_environment_changes(self, mock_env_vars):
+        """Test cached OAuthConfig values follow environment changes"""
         with patch.dict(os.environ, mock_env_vars):
-            config = OAuthConfig()
+            first = OAuthConfig()
 
-            assert config.SMTP_HOST == 'smtp.gmail.com'
-            assert config.SMTP_PORT == 587  # 数値に変換されることを確認
-            assert config.SMTP_USERNAME == 'test@example.com'
-            assert config.SMTP_PASSWORD == 'test_password'
-            assert config.SMTP_USE_TLS is True  # ブール値に変換されることを確認
+        changed_env = dict(mock_env_vars)
+        changed_env['SMTP_PORT'] = '2525'
 
-    def test_access_control_rules_parsing(self, oauth_config_service, mock_env_vars):
+        with patch.dict(os.environ, changed_env):
+            second = OAuthConfig()
+
+        assert first.SMTP_PORT == 587
+        assert second.SMTP_PORT == 2525
+
+    def test_access_control_rules_parsing(self, oauth_config_service):
         """Test access control rules parsing from environment"""
         # RED: テスト先行 - アクセス制御ルール解析がまだ実装されていない
 
-        with patch.dict(os.environ, mock_env_vars):
-            rules = oauth_config_service.parse_access_control_rules()
-
-            expected_rules = [
-                {
-                    'url_pattern': '/reviews/details',
-                    'required_permissions': ['user', 'admin', 'ally']
-                },
-                {
-                    'url_pattern': '/reviews/submit',
-                    'required_permissions': ['user', 'admin']
-                }
-            ]
-
-            assert rules == expected_rules
-
-    def test_encryption_key_validation(self, oauth_config_service, mock_env_vars):
+        rules = oauth_config_service.parse_access_control_rules()
+
+        expected_rules = [
+            {
+                'url_pattern': '/reviews/details',
+                'required_permissions': ['user', 'admin', 'ally']
+            },
+            {
+                'url_pattern': '/reviews/submit',
+                'required_permissions': ['user', 'admin']
+            }
+        ]
+
+        assert rules == expected_rules
+
+    def test_encryption_key_validation(self, oauth_config_service):
         """Test encryption key validation and format"""
         # RED: テスト先行 - 暗号化キーバリデーションがまだ実装されていない
 
-        with patch.dict(os.environ, mock_env_vars):
-            is_valid = oauth_config_service.validate_encryption_key()
+        is_valid = oauth_config_service.validate_encryption_key()
 
-            # 32バイト以上のキーが必要
-            assert is_valid is True
+        # 32バイト以上のキーが必要
+        assert is_valid is True
 
     def test_encryption_key_too_short_validation(self, mock_env_vars):
         """Test encryption key validation fails for short keys"""
@@ -141,102 +183,126 @@ class TestOAuthConfigManagement:
             with pytest.raises(ValueError, match="SMTP_HOST is required"):
                 OAuthConfig()
 
-    def test_config_service_get_google_oauth_config(self, oauth_config_service, mock_env_vars):
+    def test_config_service_get_google_oauth_config(self, oauth_config_service):
         """Test getting Google OAuth configuration"""
         # RED: テスト先行 - Google OAuth設定取得がまだ実装されていない
 
-        with patch.dict(os.environ, mock_env_vars):
-            google_config = oauth_config_service.get_google_oauth_config()
+        google_config = oauth_config_service.get_google_oauth_config()
 
-            expected_config = {
-                'client_id': 'test_google_client_id',
-                'client_secret': 'test_google_client_secret',
-                'redirect_uri': 'https://localhost:8202/auth/google/callback'
-            }
+        expected_config = {
+            'client_id': 'test_google_client_id',
+            'client_secret': 'test_google_client_secret',
+            'redirect_uri': 'https://localhost:8202/auth/google/callback'
+        }
 
-            assert google_config == expected_config
+        assert google_config == expected_config
 
-    def test_config_service_get_facebook_oauth_config(self, oauth_config_service, mock_env_vars):
+    def test_config_service_get_facebook_oauth_config(self, oauth_config_service):
         """Test getting Facebook OAuth configuration"""
         # RED: テスト先行 - Facebook OAuth設定取得がまだ実装されていない
 
-        with patch.dict(os.environ, mock_env_vars):
-            facebook_config = oauth_config_service.get_facebook_oauth_config()
+        facebook_config = oauth_config_service.get_facebook_oauth_config()
 
-            expected_config = {
-                'app_id': 'test_facebook_app_id',
-                'app_secret': 'test_facebook_app_secret',
-                'redirect_uri': 'https://localhost:8202/auth/facebook/callback'
-            }
+        expected_config = {
+            'app_id': 'test_facebook_app_id',
+            'app_secret': 'test_facebook_app_secret',
+            'redirect_uri': 'https://localhost:8202/auth/facebook/callback'
+        }
 
-            assert facebook_config == expected_config
+        assert facebook_config == expected_config
 
-    def test_config_service_get_smtp_config(self, oauth_config_service, mock_env_vars):
+    def test_config_service_get_smtp_config(self, oauth_config_service):
         """Test getting SMTP configuration"""
         # RED: テスト先行 - SMTP設定取得がまだ実装されていない
 
-        with patch.dict(os.environ, mock_env_vars):
-            smtp_config = oauth_config_service.get_smtp_config()
-
-            expected_config = {
-                'host': 'smtp.gmail.com',
-                'port': 587,
-                'username': 'test@example.com',
-                'password': 'test_password',
-                'use_tls': True
-            }
+        smtp_config = oauth_config_service.get_smtp_config()
+
+        expected_config = {
+            'host': 'smtp.gmail.com',
+            'port': 587,
+            'username': 'test@example.com',
+            'password': 'test_password',
+            'use_tls': True
+        }
+
+        assert smtp_config == expected_config
 
-            assert smtp_config == expected_config
+    def test_config_service_section_configs_are_cached_and_read_only(self, oauth_config_service):
+        """Test section configs are shared read-only views until refresh"""
+        smtp_config = oauth_config_service.get_smtp_config()
 
-    def test_config_service_get_encryption_config(self, oauth_config_service, mock_env_vars):
+        assert oauth_config_service.get_smtp_config() is smtp_config
+        with pytest.raises(TypeError):
+            smtp_config['host'] = 'other.example.com'
+
+    def test_config_service_get_encryption_config(self, oauth_config_service):
         """Test getting encryption configuration"""
         # RED: テスト先行 - 暗号化設定取得がまだ実装されていない
 
-        with patch.dict(os.environ, mock_env_vars):
-            encryption_config = oauth_config_service.get_encryption_config()
+        encryption_config = oauth_config_service.get_encryption_config()
 
-            expected_config = {
-                'encryption_key': 'test_encryption_key_32_bytes_long!',
-                'hash_salt': 'test_salt_for_hashing'
-            }
+        expected_config = {
+            'encryption_key': 'test_encryption_key_32_bytes_long!',
+            'hash_salt': 'test_salt_for_hashing'
+        }
+
+        assert encryption_config == expected_config
+
+    def test_access_control_rules_mutation_does_not_leak(self, oauth_config_service):
+        """Test modifying returned rules leaves the cached rules unchanged"""
+        rules = oauth_config_service.parse_access_control_rules()
+        rules[0]['url_pattern'] = '/changed'
+        rules[0]['required_permissions'].append('guest')
 
-            assert encryption_config == expected_config
+        fresh_rules = oauth_config_service.parse_access_control_rules()
+        assert fresh_rules[0]['url_pattern'] == '/reviews/details'
+        assert fresh_rules[0]['required_permissions'] == ['user', 'admin', 'ally']
 
-    def test_access_control_rules_empty_environment(self, mock_env_vars):
+    def test_access_control_rules_empty_environment(self, empty_rules_env):
         """Test access control rules with empty environment"""
         # RED: テスト先行 - 空の環境変数での処理がまだ実装されていない
 
-        empty_env = dict(mock_env_vars)
-        empty_env['ACCESS_CONTROL_RULES'] = ''
-
-        with patch.dict(os.environ, empty_env):
+        with patch.dict(os.environ, empty_rules_env, clear=True):
             service = OAuthConfigService()
             rules = service.parse_access_control_rules()
 
             # 空の場合はデフォルトルールを返す
             assert rules == []
 
-    def test_config_refresh_capability(self, oauth_config_service, mock_env_vars):
+    def test_access_control_rules_reparsed_on_refresh(
+        self, fresh_oauth_config_service, mock_env_vars
+    ):
+        """Test access control rules are parsed again when configuration is refreshed"""
+        new_env = dict(mock_env_vars)
+        new_env['ACCESS_CONTROL_RULES'] = '/admin,admin'
+
+        with patch.dict(os.environ, new_env):
+            fresh_oauth_config_service.refresh_config()
+
+        assert fresh_oauth_config_service.parse_access_control_rules() == [
+            {'url_pattern': '/admin', 'required_permissions': ['admin']}
+        ]
+
+    def test_config_refresh_capability(self, fresh_oauth_config_service, mock_env_vars):
         """Test configuration refresh capability"""
         # RED: テスト先行 - 設定再読み込み機能がまだ実装されていない
 
-        with patch.dict(os.environ, mock_env_vars):
-            # 初期設定を読み込み
-            initial_config = oauth_config_service.get_google_oauth_config()
+        # 初期設定を読み込み
+        initial_config = fresh_oauth_config_service.get_google_oauth_config()
 
-            # 環境変数を変更
-            new_env = dict(mock_env_vars)
-            new_env['GOOGLE_CLIENT_ID'] = 'updated_client_id'
+        # 環境変数を変更
+        new_env = dict(mock_env_vars)
+        new_env['GOOGLE_CLIENT_ID'] = 'updated_client_id'
 
-            with patch.dict(os.environ, new_env):
-                # 設定を再読み込み
-                oauth_config_service.refresh_config()
-                refreshed_config = oauth_config_service.get_google_oauth_config()
+        with patch.dict(os.environ, new_env):
+            # 設定を再読み込み
+            fresh_oauth_config_service.refresh_config()
+            refreshed_config = fresh_oauth_config_service.get_google_oauth_config()
 
-                assert refreshed_config['client_id'] == 'updated_client_id'
-                assert refreshed_config['client_id'] != initial_config['client_id']
+            assert refreshed_config['client_id'] == 'updated_client_id'
+            assert refreshed_config['client_id'] != initial_config['client_id']
 
-    def test_dotenv_file_loading(self, oauth_config_service):
+    def test_dotenv_file_loading(self, fresh_oauth_config_service, mock_env_vars):
         """Test loading configuration from .env file"""
         # RED: テスト先行 - .envファイル読み込み機能がまだ実装されていない
 
@@ -246,10 +312,74 @@ GOOGLE_CLIENT_SECRET=dotenv_google_client_secret
 SMTP_HOST=dotenv_smtp_host
 """
 
-        with patch("builtins.open", mock_open(read_data=dotenv_content)):
-            with patch("os.path.exists", return_value=True):
-                oauth_config_service.load_dotenv_config('.env')
+        # .env の値は os.environ に書き込まれるため、後続のテストに残らないようテスト内に閉じ込める
+        with patch.dict(os.environ, mock_env_vars, clear=True):
+            with patch("builtins.open", mock_open(read_data=dotenv_content)):
+                fresh_oauth_config_service.load_dotenv_config('.env')
 
                 # .envファイルから読み込まれた設定が使用されることを確認
-                google_config = oauth_config_service.get_google_oauth_config()
-                assert google_config['client_id'] == 'dotenv_google_client_id'
\ No newline at end of file
+                google_config = fresh_oauth_config_service.get_google_oauth_config()
+                assert google_config['client_id'] == 'dotenv_google_client_id'
+
+    def test_missing_dotenv_file_keeps_current_config(self, fresh_oauth_config_service, tmp_path):
+        """Test a missing .env file is skipped without touching the loaded config"""
+        before = fresh_oauth_config_service.get_google_oauth_config()
+
+        fresh_oauth_config_service.load_dotenv_config(str(tmp_path / 'missing.env'))
+
+        assert fresh_oauth_config_service.get_google_oauth_config() is before
+
+    def test_dotenv_file_reloaded_when_content_changes(
+        self, fresh_oauth_config_service, mock_env_vars, tmp_path
+    ):
+        """Test .env file is parsed again when its content changes"""
+        dotenv_file = tmp_path / '.env'
+        dotenv_file.write_text("GOOGLE_CLIENT_ID=first_client_id\n")
+
+        with patch.dict(os.environ, mock_env_vars, clear=True):
+            fresh_oauth_config_service.load_dotenv_config(str(dotenv_file))
+            client_id = fresh_oauth_config_service.get_google_oauth_config()['client_id']
+            assert client_id == 'first_client_id'
+
+            dotenv_file.write_text("GOOGLE_CLIENT_ID=second_client_id\n")
+
+            fresh_oauth_config_service.load_dotenv_config(str(dotenv_file))
+            client_id = fresh_oauth_config_service.get_google_oauth_config()['client_id']
+            assert client_id == 'second_client_id'
+
+    def test_unchanged_dotenv_content_uses_cached_parse(
+        self, fresh_oauth_config_service, mock_env_vars, tmp_path
+    ):
+        """Test .env content that is unchanged is not parsed again"""
+        dotenv_file = tmp_path / '.env'
+        dotenv_file.write_text("GOOGLE_CLIENT_ID=cached_client_id\n")
+        _parse_dotenv.cache_clear()
+
+        with patch.dict(os.environ, mock_env_vars, clear=True):
+            with patch(
+                'src.services.oauth_config_service.dotenv_values', wraps=dotenv_values
+            ) as parse:
+                fresh_oauth_config_service.load_dotenv_config(str(dotenv_file))
+                fresh_oauth_config_service.load_dotenv_config(str(dotenv_file))
+
+            assert parse.call_count == 1
+            client_id = fresh_oauth_config_service.get_google_oauth_config()['client_id']
+            assert client_id == 'cached_client_id'
+
+    def test_dotenv_references_expanded_against_current_environment(
+        self, fresh_oauth_config_service, mock_env_vars, tmp_path
+    ):
+        """Test ${VAR} references in unchanged .env content follow environment changes"""
+        dotenv_file = tmp_path / '.env'
+        dotenv_file.write_text("GOOGLE_CLIENT_ID=${CLIENT_ID_BASE}_client_id\n")
+
+        with patch.dict(os.environ, mock_env_vars, clear=True):
+            os.environ['CLIENT_ID_BASE'] = 'first'
+            fresh_oauth_config_service.load_dotenv_config(str(dotenv_file))
+            client_id = fresh_oauth_config_service.get_google_oauth_config()['client_id']
+            assert client_id == 'first_client_id'
+
+            os.environ['CLIENT_ID_BASE'] = 'second'
+            fresh_oauth_config_service.load_dotenv_config(str(dotenv_file))
+            client_id = fresh_oauth_config_service.get_google_oauth_config()['client_id']
+            assert client_id == 'second_client_id'
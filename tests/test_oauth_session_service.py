@@ -5,35 +5,112 @@ TDD approach: RED -> GREEN -> REFACTOR
 """
 import pytest
 import asyncio
-from unittest.mock import AsyncMock, patch, MagicMock
+from types import SimpleNamespace
 from datetime import datetime, timezone, timedelta
 from src.services.oauth_session_service import OAuthSessionService, OAuthSessionError
 from src.utils.result import Result
 
+# サービス側は実時刻と比較するため、基準時刻はモジュール読み込み時に一度だけ取得する
+NOW = datetime.now(timezone.utc)
+DAY = timedelta(days=1)
+HOUR = timedelta(hours=1)
+
+_BASE_SESSION = {
+    'session_id': 'test_session_12345',
+    'identity_id': 'identity_123',
+    'auth_method': 'google',
+    'user_type': 'user',
+    'email_masked': 'test***@**le.com',
+    'is_active': True,
+    'expires_at': NOW + DAY,
+    'created_at': NOW,
+    'last_accessed': NOW,
+    'user_agent': 'test_browser',
+    'ip_address': '192.168.1.1'
+}
+
+
+def _session(**overrides):
+    """Build a stored session document, overriding fields of the active base session"""
+    return {**_BASE_SESSION, **overrides}
+
+
+class _EmptyCursor:
+    """Async cursor returning no documents"""
+    __slots__ = ()
+
+    async def to_list(self, length=None):
+        return []
+
+
+_EMPTY_CURSOR = _EmptyCursor()
+
+
+class FakeDB:
+    """Lightweight stand-in for DatabaseService (records calls, returns canned results)
+
+    Tests set ``find_one_result`` to the document find_one returns and
+    ``create_error`` to an exception create raises.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Clear recorded calls and restore default canned results"""
+        self.calls = []
+        self.find_one_result = None
+        self.create_error = None
+
+    def called(self, method):
+        """Whether the given method has been called"""
+        return any(name == method for name, _ in self.calls)
+
+    async def create(self, collection, document):
+        self.calls.append(('create', (collection, document)))
+        if self.create_error:
+            raise self.create_error
+        return 'test_session_id'
+
+    async def find_one(self, collection, filter_dict):
+        self.calls.append(('find_one', (collection, filter_dict)))
+        return self.find_one_result
+
+    async def update_one(self, collection, filter_dict, update_dict):
+        self.calls.append(('update_one', (collection, filter_dict, update_dict)))
+        return SimpleNamespace(modified_count=1)
+
+    async def update_many(self, collection, filter_dict, update_dict):
+        self.calls.append(('update_many', (collection, filter_dict, update_dict)))
+        return SimpleNamespace(modified_count=1)
+
+    async def delete_many(self, collection, filter_dict):
+        self.calls.append(('delete_many', (collection, filter_dict)))
+        return SimpleNamespace(deleted_count=1)
+
+    def find(self, collection, filter_dict=None):
+        self.calls.append(('find', (collection, filter_dict)))
+        return _EMPTY_CURSOR
+
 
 class TestOAuthSessionService:
     """Test OAuth session service for identity-based session management"""
 
-    @pytest.fixture
+    @pytest.fixture(scope='module')
     def oauth_session_service(self):
-        """OAuth session service fixture with mocked dependencies"""
+        """OAuth session service fixture with a fake database service (shared within the module)"""
         service = OAuthSessionService()
+        service.db_service = FakeDB()
+        return service
 
-        # Mock database service
-        mock_db_service = MagicMock()
-        mock_db_service.create = AsyncMock(return_value='test_session_id')
-        mock_db_service.find_one = AsyncMock(return_value=None)
-        mock_db_service.update_one = AsyncMock(return_value=MagicMock(modified_count=1))
-        mock_db_service.update_many = AsyncMock(return_value=MagicMock(modified_count=1))
-        mock_db_service.delete_many = AsyncMock(return_value=MagicMock(deleted_count=1))
-
-        # Mock find method with async cursor
-        mock_cursor = AsyncMock()
-        mock_cursor.to_list = AsyncMock(return_value=[])
-        mock_db_service.find = MagicMock(return_value=mock_cursor)
+    @pytest.fixture(autouse=True)
+    def _reset_db(self, oauth_session_service):
+        """Reset fake database state between tests
 
-        service.db_service = mock_db_service
-        return service
+        Canned results and injected errors (find_one_result, create_error)
+        do not persist beyond the test that sets them.
+        """
+        oauth_session_service.db_service.reset()
 
     @pytest.mark.asyncio
     async def test_create_oauth_session(self, oauth_session_service):
@@ -62,20 +139,7 @@ class TestOAuthSessionService:
         session_id = 'test_session_12345'
 
         # Mock active session
-        active_session = {
-            'session_id': session_id,
-            'identity_id': 'identity_123',
-            'auth_method': 'google',
-            'user_type': 'user',
-            'email_masked': 'test***@**le.com',
-            'is_active': True,
-            'expires_at': datetime.now(timezone.utc) + timedelta(days=1),
-            'created_at': datetime.now(timezone.utc),
-            'last_accessed': datetime.now(timezone.utc),
-            'user_agent': 'test_browser',
-            'ip_address': '192.168.1.1'
-        }
-        oauth_session_service.db_service.find_one.return_value = active_session
+        oauth_session_service.db_service.find_one_result = _session(session_id=session_id)
 
         result = await oauth_session_service.validate_oauth_session(session_id)
 
@@ -113,20 +177,12 @@ class TestOAuthSessionService:
         session_id = 'expired_session_123'
 
         # Mock expired session
-        expired_session = {
-            'session_id': session_id,
-            'identity_id': 'identity_123',
-            'auth_method': 'google',
-            'user_type': 'user',
-            'email_masked': 'test***@**le.com',
-            'is_active': True,
-            'expires_at': datetime.now(timezone.utc) - timedelta(hours=1),  # Expired
-            'created_at': datetime.now(timezone.utc) - timedelta(days=1),
-            'last_accessed': datetime.now(timezone.utc) - timedelta(hours=2),
-            'user_agent': 'test_browser',
-            'ip_address': '192.168.1.1'
-        }
-        oauth_session_service.db_service.find_one.return_value = expired_session
+        oauth_session_service.db_service.find_one_result = _session(
+            session_id=session_id,
+            expires_at=NOW - HOUR,  # Expired
+            created_at=NOW - DAY,
+            last_accessed=NOW - 2 * HOUR
+        )
 
         result = await oauth_session_service.validate_oauth_session(session_id)
 
@@ -134,7 +190,7 @@ class TestOAuthSessionService:
         assert "expired" in str(result.error).lower()
 
         # Should mark session as expired in database
-        oauth_session_service.db_service.update_one.assert_called()
+        assert oauth_session_service.db_service.called('update_one')
 
     @pytest.mark.asyncio
     async def test_logout_session(self, oauth_session_service):
@@ -149,7 +205,7 @@ class TestOAuthSessionService:
         assert result.data is True
 
         # Should update session to inactive
-        oauth_session_service.db_service.update_one.assert_called()
+        assert oauth_session_service.db_service.called('update_one')
 
     @pytest.mark.asyncio
     async def test_session_security_validation(self, oauth_session_service):
@@ -162,20 +218,9 @@ class TestOAuthSessionService:
         session_id = session_result.data['session_id']
 
         # Mock session with different IP
-        session_with_ip = {
-            'session_id': session_id,
-            'identity_id': 'identity_123',
-            'auth_method': 'google',
-            'user_type': 'user',
-            'email_masked': 'test***@**le.com',
-            'ip_address': '192.168.1.1',
-            'user_agent': 'browser',
-            'is_active': True,
-            'expires_at': datetime.now(timezone.utc) + timedelta(days=1),
-            'created_at': datetime.now(timezone.utc),
-            'last_accessed': datetime.now(timezone.utc)
-        }
-        oauth_session_service.db_service.find_one.return_value = session_with_ip
+        oauth_session_service.db_service.find_one_result = _session(
+            session_id=session_id, user_agent='browser'
+        )
 
         # Validate from different IP
         result = await oauth_session_service.validate_oauth_session(session_id, '10.0.0.1')
@@ -195,7 +240,12 @@ class TestOAuthSessionService:
         assert isinstance(result.data, int)  # Number of cleaned sessions
 
         # Should delete expired sessions
-        oauth_session_service.db_service.delete_many.assert_called()
+        assert oauth_session_service.db_service.called('delete_many')
+
+        # Should delete both expired and inactive sessions
+        _, (_, filter_dict) = oauth_session_service.db_service.calls[-1]
+        assert filter_dict['$or'][0]['expires_at']['$lt'] <= datetime.now(timezone.utc)
+        assert filter_dict['$or'][1] == {'is_active': False}
 
     @pytest.mark.asyncio
     async def test_get_active_sessions_for_identity(self, oauth_session_service):
@@ -247,13 +297,13 @@ class TestOAuthSessionService:
 
         identity = {'id': 'identity_123', 'auth_method': 'google', 'user_type': 'user'}
 
-        # Create multiple sessions
-        sessions = []
-        for i in range(5):
-            result = await oauth_session_service.create_oauth_session(
-                identity, f'browser_{i}', f'192.168.1.{i+1}'
-            )
-            sessions.append(result.data['session_id'])
+        # Create multiple sessions concurrently
+        results = await asyncio.gather(*(
+            oauth_session_service.create_oauth_session(identity, f'browser_{i}', f'192.168.1.{i+1}')
+            for i in range(5)
+        ))
+        sessions = [result.data['session_id'] for result in results]
+        assert len(set(sessions)) == 5
 
         # Should enforce session limit (e.g., max 3 concurrent sessions)
         # Older sessions should be invalidated
@@ -271,7 +321,7 @@ class TestOAuthSessionService:
         assert 'new_expires_at' in result.data
 
         # Should extend session expiration time
-        oauth_session_service.db_service.update_one.assert_called()
+        assert oauth_session_service.db_service.called('update_one')
 
     @pytest.mark.asyncio
     async def test_invalid_session_handling(self, oauth_session_service):
@@ -290,7 +340,7 @@ class TestOAuthSessionService:
     async def test_database_error_handling(self, oauth_session_service):
         """RED: Test handling of database errors"""
         # Mock database failure
-        oauth_session_service.db_service.create = AsyncMock(side_effect=Exception("Database error"))
+        oauth_session_service.db_service.create_error = Exception("Database error")
 
         identity = {'id': 'identity_123', 'auth_method': 'google', 'user_type': 'user'}
 
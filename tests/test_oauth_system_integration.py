@@ -13,19 +13,41 @@ from src.services.auth_error_handler import AuthErrorHandler
 from src.utils.result import Result
 
 
+# Stored session documents per role (tests copy them and fill in session_id)
+_ADMIN_SESSION_DOC = {
+    'identity_id': 'admin_123',
+    'user_type': 'admin',
+    'auth_method': 'email',
+    'is_active': True,
+    'expires_at': '2024-12-31T23:59:59Z',
+    'last_accessed': '2024-01-01T00:00:00Z'
+}
+
+_USER_SESSION_DOC = {
+    'identity_id': 'user_123',
+    'user_type': 'user',
+    'auth_method': 'facebook',
+    'is_active': True,
+    'expires_at': '2024-12-31T23:59:59Z',
+    'last_accessed': '2024-01-01T00:00:00Z'
+}
+
+_IP_BOUND_SESSION_DOC = {
+    'identity_id': 'user_123',
+    'user_type': 'user',
+    'ip_address': '192.168.1.1',
+    'is_active': True,
+    'expires_at': '2024-12-31T23:59:59Z',
+    'last_accessed': '2024-01-01T00:00:00Z'
+}
+
+
 class TestOAuthSystemIntegration:
     """Integration tests for complete OAuth authentication system"""
 
     @pytest.fixture
-    def oauth_system(self):
-        """Complete OAuth system fixture"""
-        # Initialize all components
-        session_service = OAuthSessionService()
-        access_control = AccessControlMiddleware()
-        ui_service = UIAuthService()
-        error_handler = AuthErrorHandler()
-
-        # Mock database service
+    def mock_db_service(self):
+        """Mock database service with default return values"""
         mock_db_service = MagicMock()
         mock_db_service.create = AsyncMock(return_value='test_session_id')
         mock_db_service.find_one = AsyncMock(return_value=None)
@@ -37,8 +59,22 @@ class TestOAuthSystemIntegration:
         mock_cursor = AsyncMock()
         mock_cursor.to_list = AsyncMock(return_value=[])
         mock_db_service.find = MagicMock(return_value=mock_cursor)
+        return mock_db_service
+
+    @pytest.fixture
+    def oauth_system(self, mock_db_service):
+        """Complete OAuth system fixture"""
+        # Initialize all components
+        session_service = OAuthSessionService()
+        access_control = AccessControlMiddleware()
+        ui_service = UIAuthService()
+        error_handler = AuthErrorHandler()
 
         session_service.db_service = mock_db_service
+        # Wrap session validation once so tests can inject failures via side_effect
+        session_service.validate_oauth_session = AsyncMock(
+            wraps=session_service.validate_oauth_session
+        )
 
         # Configure access control with test rules
         access_control.access_rules = [
@@ -115,13 +151,7 @@ class TestOAuthSystemIntegration:
 
         # Mock session validation for admin
         session_service.db_service.find_one.return_value = {
-            'session_id': admin_session_id,
-            'identity_id': 'admin_123',
-            'user_type': 'admin',
-            'auth_method': 'email',
-            'is_active': True,
-            'expires_at': '2024-12-31T23:59:59Z',
-            'last_accessed': '2024-01-01T00:00:00Z'
+            **_ADMIN_SESSION_DOC, 'session_id': admin_session_id
         }
 
         # Admin should access all protected areas
@@ -140,13 +170,7 @@ class TestOAuthSystemIntegration:
 
         # Mock session validation for user
         session_service.db_service.find_one.return_value = {
-            'session_id': user_session_id,
-            'identity_id': 'user_123',
-            'user_type': 'user',
-            'auth_method': 'facebook',
-            'is_active': True,
-            'expires_at': '2024-12-31T23:59:59Z',
-            'last_accessed': '2024-01-01T00:00:00Z'
+            **_USER_SESSION_DOC, 'session_id': user_session_id
         }
 
         user_access = await access_control.check_access('/admin', user_session_id)
@@ -169,13 +193,7 @@ class TestOAuthSystemIntegration:
 
         # Mock session with IP validation
         session_service.db_service.find_one.return_value = {
-            'session_id': session_id,
-            'identity_id': 'user_123',
-            'user_type': 'user',
-            'ip_address': '192.168.1.1',
-            'is_active': True,
-            'expires_at': '2024-12-31T23:59:59Z',
-            'last_accessed': '2024-01-01T00:00:00Z'
+            **_IP_BOUND_SESSION_DOC, 'session_id': session_id
         }
 
         # Access from same IP should succeed
@@ -203,8 +221,8 @@ class TestOAuthSystemIntegration:
         assert 'error_id' in error_result.metadata
 
         # Test service unavailable error cascading through UI
-        ui_service.session_service.validate_oauth_session = AsyncMock(
-            side_effect=Exception("Database connection failed")
+        ui_service.session_service.validate_oauth_session.side_effect = Exception(
+            "Database connection failed"
         )
 
         ui_result = await ui_service.get_user_menu_info('session_123')
@@ -221,12 +239,12 @@ class TestOAuthSystemIntegration:
             'user_type': 'user'
         }
 
-        # Create multiple sessions for same user
-        sessions = []
-        for i in range(5):
-            result = await session_service.create_oauth_session(identity, f'browser_{i}', f'192.168.1.{i+1}')
-            if result.is_success:
-                sessions.append(result.data['session_id'])
+        # Create multiple sessions for same user concurrently
+        results = await asyncio.gather(*(
+            session_service.create_oauth_session(identity, f'browser_{i}', f'192.168.1.{i+1}')
+            for i in range(5)
+        ))
+        sessions = [result.data['session_id'] for result in results if result.is_success]
 
         # Verify sessions were created
         assert len(sessions) > 0
@@ -308,8 +326,8 @@ class TestOAuthSystemIntegration:
         ui_service = oauth_system['ui_service']
 
         # Test graceful handling of service failures
-        ui_service.session_service.validate_oauth_session = AsyncMock(
-            side_effect=Exception("Service temporarily unavailable")
+        ui_service.session_service.validate_oauth_session.side_effect = Exception(
+            "Service temporarily unavailable"
         )
 
         # UI should still provide meaningful responses
@@ -6,6 +6,7 @@ Tests for automatic PC/Mobile layout switching at 768px breakpoint.
 """
 
 import unittest
+from dataclasses import dataclass
 from unittest.mock import patch, MagicMock
 from tornado.testing import AsyncHTTPTestCase
 import sys
@@ -20,211 +21,224 @@ sys.path.insert(0, project_root)
 from src.app import create_app
 
 
+# 768px 以上（PC向け）/ 767px 以下（モバイル向け）のメディアクエリ
+PC_MQ_RE = re.compile(rb'@media\s*\([^)]*min-width:\s*768px[^)]*\)')
+MOBILE_MQ_RE = re.compile(rb'@media\s*\([^)]*max-width:\s*767px[^)]*\)')
+
+# PC向けGridレイアウトのCSS設定
+GRID_RES = tuple(re.compile(p) for p in (
+    rb'display:\s*grid',
+    rb'grid-template-columns',
+    rb'grid-gap|gap'
+))
+
+# モバイル向け縦方向レイアウトのCSS設定
+# （いずれか一つがあればよいため、一つの選択パターンで一度だけ走査する）
+MOBILE_LAYOUT_RE = re.compile(b'|'.join((
+    rb'flex-direction:\s*column',
+    rb'display:\s*block',
+    rb'width:\s*100%'
+)), re.IGNORECASE)
+
+# サイドバーのレスポンシブ制御CSS
+SIDEBAR_RES = tuple(re.compile(p, re.IGNORECASE | re.MULTILINE) for p in (
+    rb'@media\s*\([^)]*max-width:\s*767px[^)]*\)[\s\S]*?display:\s*none',
+    rb'sidebar[\s\S]*?@media[\s\S]*?display:\s*none'
+))
+# サイドバー要素（aside/nav の class に sidebar/navigation を含む）。
+# 有無だけを見るため本文のバイト列を直接検索する
+SIDEBAR_EL_RE = re.compile(
+    rb'<(?:aside|nav)\b[^>]*\bclass=["\'][^"\']*(?:sidebar|navigation)', re.I
+)
+
+# タブバーのモバイル表示制御CSS
+TAB_RES = tuple(re.compile(p) for p in (
+    rb'position:\s*fixed',
+    rb'bottom:\s*0',
+    rb'@media\s*\([^)]*max-width:\s*767px[^)]*\)[\s\S]*?display:\s*(block|flex)'
+))
+# 下部タブバー要素（nav/div の class に tab-bar/bottom-nav/mobile-nav を含む）
+TAB_EL_RE = re.compile(
+    rb'<(?:nav|div)\b[^>]*\bclass=["\'][^"\']*(?:tab-bar|bottom-nav|mobile-nav)', re.I
+)
+
+# メインコンテンツのマージン調整CSS
+MARGIN_RE = re.compile(b'|'.join((
+    rb'margin-left:\s*0',  # サイドバー分のマージン削除
+    rb'padding-bottom:\s*\d+px',  # タブバー分のパディング追加
+    rb'@media\s*\([^)]*max-width:\s*767px[^)]*\)[\s\S]*?margin'
+)), re.IGNORECASE)
+
+# 768pxブレークポイントの値 / PC向け / モバイル向け
+BREAKPOINT_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    rb'768px',
+    rb'min-width:\s*768px',
+    rb'max-width:\s*767px'
+))
+
+# Grid未対応ブラウザ向けのフォールバックCSS（Flexbox / ブロック / フロート）
+FALLBACK_RE = re.compile(b'|'.join((
+    rb'display:\s*flex',
+    rb'display:\s*block',
+    rb'float:\s*(left|right)'
+)), re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class _CompanyPage:
+    """企業詳細ページの取得結果"""
+    code: int
+    body: bytes
+
+
 class ResponsiveLayoutSwitchingTest(AsyncHTTPTestCase):
     """Task 6.1: デバイス検知とレイアウト自動切り替え機能のテスト"""
 
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # 企業データの取得はクラス全体でモックする（全テストで同じ企業データを返す）
+        cls._get_company_patcher = patch('src.services.company_service.CompanyService.get_company')
+        cls._get_company_mock = cls._get_company_patcher.start()
+
+        # オブジェクトライクなモックデータを作成
+        # （各テストは参照のみのため、クラスで一度だけ作成する）
+        cls.test_company = MagicMock()
+        cls.test_company.id = 'test-company-001'
+        cls.test_company.name = 'テスト企業株式会社'
+        cls.test_company.industry = MagicMock()
+        cls.test_company.industry.value = 'information_technology'
+        cls.test_company.size = MagicMock()
+        cls.test_company.size.value = 'medium'
+        cls.test_company.location = '東京都渋谷区'
+        cls.test_company.country = '日本'
+        cls.test_company.website_url = 'https://example.com'
+        cls.test_company.description = 'テスト企業の説明'
+        cls.test_company.employee_count = 500
+        cls.test_company.founded_year = 2010
+        cls.test_company.capital = 100000000
+        cls._get_company_mock.return_value = cls.test_company
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._get_company_patcher.stop()
+        super().tearDownClass()
+
     def get_app(self):
         return create_app()
 
-    def setUp(self):
-        super().setUp()
-        from unittest.mock import MagicMock
+    def _get_company_page(self) -> _CompanyPage:
+        """企業詳細ページを取得する（IOLoop はテストごとに作り直されるため、テスト内で取得する）"""
+        response = self.fetch('/companies/test-company-001')
+        return _CompanyPage(
+            code=response.code,
+            body=response.body
+        )
 
-        # オブジェクトライクなモックデータを作成
-        self.test_company = MagicMock()
-        self.test_company.id = 'test-company-001'
-        self.test_company.name = 'テスト企業株式会社'
-        self.test_company.industry = MagicMock()
-        self.test_company.industry.value = 'information_technology'
-        self.test_company.size = MagicMock()
-        self.test_company.size.value = 'medium'
-        self.test_company.location = '東京都渋谷区'
-        self.test_company.country = '日本'
-        self.test_company.website_url = 'https://example.com'
-        self.test_company.description = 'テスト企業の説明'
-        self.test_company.employee_count = 500
-        self.test_company.founded_year = 2010
-        self.test_company.capital = 100000000
-
-    @patch('src.services.company_service.CompanyService.get_company')
-    def test_pc_layout_media_query_exists(self, mock_get_company):
+    def test_pc_layout_media_query_exists(self):
         """RED: PC向けメディアクエリ（768px以上）が存在するかテスト"""
-        mock_get_company.return_value = self.test_company
-
-        response = self.fetch('/companies/test-company-001')
-        self.assertEqual(response.code, 200)
+        page = self._get_company_page()
+        self.assertEqual(page.code, 200)
 
-        response_body = response.body.decode('utf-8')
+        response_body = page.body
 
         # 768px以上のメディアクエリが存在することを確認
-        pc_media_query_pattern = r'@media\s*\([^)]*min-width:\s*768px[^)]*\)'
-        self.assertRegex(response_body, pc_media_query_pattern,
+        self.assertRegex(response_body, PC_MQ_RE,
                         "PC向けメディアクエリ（min-width: 768px）が見つかりません")
 
-    @patch('src.services.company_service.CompanyService.get_company')
-    def test_mobile_layout_media_query_exists(self, mock_get_company):
+    def test_mobile_layout_media_query_exists(self):
         """RED: モバイル向けメディアクエリ（768px未満）が存在するかテスト"""
-        mock_get_company.return_value = self.test_company
+        page = self._get_company_page()
+        self.assertEqual(page.code, 200)
 
-        response = self.fetch('/companies/test-company-001')
-        self.assertEqual(response.code, 200)
-
-        response_body = response.body.decode('utf-8')
+        response_body = page.body
 
         # 768px未満のメディアクエリが存在することを確認
-        mobile_media_query_pattern = r'@media\s*\([^)]*max-width:\s*767px[^)]*\)'
-        self.assertRegex(response_body, mobile_media_query_pattern,
+        self.assertRegex(response_body, MOBILE_MQ_RE,
                         "モバイル向けメディアクエリ（max-width: 767px）が見つかりません")
 
-    @patch('src.services.company_service.CompanyService.get_company')
-    def test_grid_layout_pc_configuration(self, mock_get_company):
+    def test_grid_layout_pc_configuration(self):
         """RED: PC環境でCSS Gridレイアウトが適用されるかテスト"""
-        mock_get_company.return_value = self.test_company
-
-        response = self.fetch('/companies/test-company-001')
-        self.assertEqual(response.code, 200)
+        page = self._get_company_page()
+        self.assertEqual(page.code, 200)
 
-        response_body = response.body.decode('utf-8')
+        response_body = page.body
 
         # PC向けGridレイアウトのCSS設定が存在することを確認
-        grid_layout_patterns = [
-            r'display:\s*grid',
-            r'grid-template-columns',
-            r'grid-gap|gap'
-        ]
-
-        for pattern in grid_layout_patterns:
-            self.assertRegex(response_body, pattern,
-                           f"CSS Gridレイアウトの設定 '{pattern}' が見つかりません")
-
-    @patch('src.services.company_service.CompanyService.get_company')
-    def test_mobile_vertical_layout_configuration(self, mock_get_company):
-        """RED: モバイル環境で縦方向レイアウトが適用されるかテスト"""
-        mock_get_company.return_value = self.test_company
+        for regex in GRID_RES:
+            self.assertRegex(response_body, regex,
+                           f"CSS Gridレイアウトの設定 '{regex.pattern.decode()}' が見つかりません")
 
-        response = self.fetch('/companies/test-company-001')
-        self.assertEqual(response.code, 200)
+    def test_mobile_vertical_layout_configuration(self):
+        """RED: モバイル環境で縦方向レイアウトが適用されるかテスト"""
+        page = self._get_company_page()
+        self.assertEqual(page.code, 200)
 
-        response_body = response.body.decode('utf-8')
+        response_body = page.body
 
         # モバイル向け縦方向レイアウトのCSS設定確認
-        mobile_layout_patterns = [
-            r'flex-direction:\s*column',
-            r'display:\s*block',
-            r'width:\s*100%'
-        ]
-
-        has_mobile_layout = any(
-            re.search(pattern, response_body, re.IGNORECASE)
-            for pattern in mobile_layout_patterns
-        )
+        has_mobile_layout = MOBILE_LAYOUT_RE.search(response_body) is not None
 
         self.assertTrue(has_mobile_layout,
                        "モバイル向け縦方向レイアウトの設定が見つかりません")
 
-    @patch('src.services.company_service.CompanyService.get_company')
-    def test_sidebar_visibility_responsive_behavior(self, mock_get_company):
+    def test_sidebar_visibility_responsive_behavior(self):
         """RED: サイドバーのレスポンシブ表示制御が実装されているかテスト"""
-        mock_get_company.return_value = self.test_company
-
-        response = self.fetch('/companies/test-company-001')
-        self.assertEqual(response.code, 200)
-
-        soup = BeautifulSoup(response.body, 'html.parser')
+        page = self._get_company_page()
+        self.assertEqual(page.code, 200)
 
         # サイドバー要素の存在確認
-        sidebar = soup.find(['aside', 'nav'], class_=re.compile(r'sidebar|navigation'))
-        self.assertIsNotNone(sidebar, "サイドバー要素が見つかりません")
+        self.assertIsNotNone(SIDEBAR_EL_RE.search(page.body), "サイドバー要素が見つかりません")
 
-        response_body = response.body.decode('utf-8')
+        response_body = page.body
 
         # サイドバーのレスポンシブ制御CSS確認
-        sidebar_responsive_patterns = [
-            r'@media\s*\([^)]*max-width:\s*767px[^)]*\)[\s\S]*?display:\s*none',
-            r'sidebar[\s\S]*?@media[\s\S]*?display:\s*none'
-        ]
-
-        has_sidebar_control = any(
-            re.search(pattern, response_body, re.IGNORECASE | re.MULTILINE)
-            for pattern in sidebar_responsive_patterns
-        )
+        has_sidebar_control = any(regex.search(response_body) for regex in SIDEBAR_RES)
 
         self.assertTrue(has_sidebar_control,
                        "サイドバーのレスポンシブ表示制御が見つかりません")
 
-    @patch('src.services.company_service.CompanyService.get_company')
-    def test_bottom_tab_bar_mobile_visibility(self, mock_get_company):
+    def test_bottom_tab_bar_mobile_visibility(self):
         """RED: 下部タブバーのモバイル環境での表示制御テスト"""
-        mock_get_company.return_value = self.test_company
-
-        response = self.fetch('/companies/test-company-001')
-        self.assertEqual(response.code, 200)
-
-        soup = BeautifulSoup(response.body, 'html.parser')
+        page = self._get_company_page()
+        self.assertEqual(page.code, 200)
 
         # 下部タブバー要素の存在確認
-        tab_bar = soup.find(['nav', 'div'], class_=re.compile(r'tab-bar|bottom-nav|mobile-nav'))
-        self.assertIsNotNone(tab_bar, "下部タブバー要素が見つかりません")
+        self.assertIsNotNone(TAB_EL_RE.search(page.body), "下部タブバー要素が見つかりません")
 
-        response_body = response.body.decode('utf-8')
+        response_body = page.body
 
         # タブバーのモバイル表示制御CSS確認
-        tab_bar_patterns = [
-            r'position:\s*fixed',
-            r'bottom:\s*0',
-            r'@media\s*\([^)]*max-width:\s*767px[^)]*\)[\s\S]*?display:\s*(block|flex)'
-        ]
-
-        for pattern in tab_bar_patterns:
-            self.assertRegex(response_body, pattern,
-                           f"タブバーのモバイル表示制御 '{pattern}' が見つかりません")
-
-    @patch('src.services.company_service.CompanyService.get_company')
-    def test_main_content_margin_adjustments(self, mock_get_company):
-        """RED: メインコンテンツのマージン調整がレスポンシブに対応しているかテスト"""
-        mock_get_company.return_value = self.test_company
+        for regex in TAB_RES:
+            self.assertRegex(
+                response_body, regex,
+                f"タブバーのモバイル表示制御 '{regex.pattern.decode()}' が見つかりません"
+            )
 
-        response = self.fetch('/companies/test-company-001')
-        self.assertEqual(response.code, 200)
+    def test_main_content_margin_adjustments(self):
+        """RED: メインコンテンツのマージン調整がレスポンシブに対応しているかテスト"""
+        page = self._get_company_page()
+        self.assertEqual(page.code, 200)
 
-        response_body = response.body.decode('utf-8')
+        response_body = page.body
 
         # メインコンテンツのマージン調整CSS確認
-        margin_adjustment_patterns = [
-            r'margin-left:\s*0',  # サイドバー分のマージン削除
-            r'padding-bottom:\s*\d+px',  # タブバー分のパディング追加
-            r'@media\s*\([^)]*max-width:\s*767px[^)]*\)[\s\S]*?margin'
-        ]
-
-        has_margin_adjustments = any(
-            re.search(pattern, response_body, re.IGNORECASE)
-            for pattern in margin_adjustment_patterns
-        )
+        has_margin_adjustments = MARGIN_RE.search(response_body) is not None
 
         self.assertTrue(has_margin_adjustments,
                        "メインコンテンツのマージン調整が見つかりません")
 
-    @patch('src.services.company_service.CompanyService.get_company')
-    def test_breakpoint_consistency_across_styles(self, mock_get_company):
+    def test_breakpoint_consistency_across_styles(self):
         """RED: 768pxブレークポイントの一貫性テスト"""
-        mock_get_company.return_value = self.test_company
-
-        response = self.fetch('/companies/test-company-001')
-        self.assertEqual(response.code, 200)
+        page = self._get_company_page()
+        self.assertEqual(page.code, 200)
 
-        response_body = response.body.decode('utf-8')
+        response_body = page.body
 
         # 768pxブレークポイントの一貫した使用を確認
-        breakpoint_patterns = [
-            r'768px',  # ブレークポイント値の存在
-            r'min-width:\s*768px',  # PC向け
-            r'max-width:\s*767px'   # モバイル向け
-        ]
-
         breakpoint_matches = []
-        for pattern in breakpoint_patterns:
-            matches = re.findall(pattern, response_body, re.IGNORECASE)
-            breakpoint_matches.extend(matches)
+        for regex in BREAKPOINT_RES:
+            breakpoint_matches.extend(regex.findall(response_body))
 
         # 少なくとも両方向のブレークポイントが存在することを確認
         self.assertGreaterEqual(len(breakpoint_matches), 2,
@@ -235,7 +249,7 @@ class ResponsiveLayoutSwitchingTest(AsyncHTTPTestCase):
         response = self.fetch('/')
         self.assertEqual(response.code, 200)
 
-        soup = BeautifulSoup(response.body, 'html.parser')
+        soup = BeautifulSoup(response.body, 'lxml', from_encoding='utf-8')
 
         # viewportメタタグの存在確認
         viewport_meta = soup.find('meta', attrs={'name': 'viewport'})
@@ -249,27 +263,15 @@ class ResponsiveLayoutSwitchingTest(AsyncHTTPTestCase):
             self.assertIn(setting, content,
                          f"viewport設定に '{setting}' が含まれていません")
 
-    @patch('src.services.company_service.CompanyService.get_company')
-    def test_css_grid_fallback_support(self, mock_get_company):
+    def test_css_grid_fallback_support(self):
         """RED: CSS Gridのフォールバック機能テスト"""
-        mock_get_company.return_value = self.test_company
+        page = self._get_company_page()
+        self.assertEqual(page.code, 200)
 
-        response = self.fetch('/companies/test-company-001')
-        self.assertEqual(response.code, 200)
-
-        response_body = response.body.decode('utf-8')
+        response_body = page.body
 
         # Grid未対応ブラウザ向けのフォールバックCSS確認
-        fallback_patterns = [
-            r'display:\s*flex',  # Flexboxフォールバック
-            r'display:\s*block',  # ブロックレイアウトフォールバック
-            r'float:\s*(left|right)'  # フロートレイアウトフォールバック
-        ]
-
-        has_fallback = any(
-            re.search(pattern, response_body, re.IGNORECASE)
-            for pattern in fallback_patterns
-        )
+        has_fallback = FALLBACK_RE.search(response_body) is not None
 
         self.assertTrue(has_fallback,
                        "CSS Gridのフォールバック機能が見つかりません")
@@ -3,11 +3,52 @@ ReviewAggregationService のユニットテスト
 """
 import pytest
 import pytest_asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, timezone
 from bson import ObjectId
-from src.services.review_aggregation_service import ReviewAggregationService
+from src.services.review_aggregation_service import CATEGORIES, ReviewAggregationService
 from src.database import DatabaseService
 
+_COMPANY_ID = "000000000000000000000001"
+
+# 集計元レビューの状態（保存済みの review_summary.source_state と比較される）
+_SOURCE_STATE = {
+    "review_count": 2,
+    "active_count": 2,
+    "last_modified": datetime(2024, 1, 1, tzinfo=timezone.utc)
+}
+
+# 集計パイプラインの $group 結果（2件とも全カテゴリ4点）
+_SUMMARY = {
+    "total_reviews": 2,
+    **dict.fromkeys(CATEGORIES, 4.0),
+    "last_review_date": datetime(2024, 1, 1, tzinfo=timezone.utc)
+}
+
+
+def _mock_db(source_states, stored_state):
+    """集計元の状態・集計結果・保存済みの review_summary を返すデータベースのモック"""
+    async def aggregate(collection, pipeline):
+        # 状態取得のパイプラインは active_count を $group に含む
+        if "active_count" in pipeline[-1]["$group"]:
+            return source_states
+        return [_SUMMARY]
+
+    mock_db = MagicMock()
+    mock_db.aggregate = AsyncMock(side_effect=aggregate)
+    mock_db.find_one = AsyncMock(return_value={
+        "_id": ObjectId(_COMPANY_ID),
+        "review_summary": {
+            "total_reviews": 2,
+            "overall_average": 4.0,
+            "category_averages": {},
+            "last_review_date": None,
+            "source_state": stored_state
+        }
+    })
+    mock_db.update_one = AsyncMock(return_value=1)
+    return mock_db
+
 
 @pytest_asyncio.fixture
 async def service_and_db():
@@ -32,70 +73,6 @@ async def service_and_db():
 class TestReviewAggregationService:
     """ReviewAggregationService のテストクラス"""
 
-    @pytest.mark.asyncio
-    async def test_calculate_category_averages_with_none_values(self, service_and_db):
-        """None値を含むレビューの集計が正しく計算される"""
-        service, _ = service_and_db
-        reviews = [
-            {
-                "ratings": {
-                    "recommendation": 4,
-                    "foreign_support": None,
-                    "company_culture": 3,
-                    "employee_relations": 5,
-                    "evaluation_system": None,
-                    "promotion_treatment": 4
-                }
-            },
-            {
-                "ratings": {
-                    "recommendation": 5,
-                    "foreign_support": 2,
-                    "company_culture": None,
-                    "employee_relations": 4,
-                    "evaluation_system": 3,
-                    "promotion_treatment": None
-                }
-            }
-        ]
-
-        averages = service.calculate_category_averages(reviews)
-
-        # recommendation: (4 + 5) / 2 = 4.5
-        assert averages["recommendation"] == 4.5
-        # foreign_support: 2 / 1 = 2.0（None除外）
-        assert averages["foreign_support"] == 2.0
-        # company_culture: 3 / 1 = 3.0（None除外）
-        assert averages["company_culture"] == 3.0
-        # employee_relations: (5 + 4) / 2 = 4.5
-        assert averages["employee_relations"] == 4.5
-        # evaluation_system: 3 / 1 = 3.0（None除外）
-        assert averages["evaluation_system"] == 3.0
-        # promotion_treatment: 4 / 1 = 4.0（None除外）
-        assert averages["promotion_treatment"] == 4.0
-
-    @pytest.mark.asyncio
-    async def test_calculate_category_averages_all_none(self, service_and_db):
-        """すべてNoneの場合は0.0を返す"""
-        service, _ = service_and_db
-        reviews = [
-            {
-                "ratings": {
-                    "recommendation": None,
-                    "foreign_support": None,
-                    "company_culture": None,
-                    "employee_relations": None,
-                    "evaluation_system": None,
-                    "promotion_treatment": None
-                }
-            }
-        ]
-
-        averages = service.calculate_category_averages(reviews)
-
-        for category, value in averages.items():
-            assert value == 0.0, f"Category {category} should be 0.0 when all values are None"
-
     @pytest.mark.asyncio
     async def test_calculate_overall_average(self, service_and_db):
         """総合評価平均が全カテゴリの平均値の平均として計算される"""
@@ -180,9 +157,10 @@ class TestReviewAggregationService:
             datetime(2024, 3, 1, tzinfo=timezone.utc)  # 最新
         ]
 
-        for i, review_date in enumerate(review_dates):
-            await db.create("reviews", {
-                "company_id": ObjectId(company_id),
+        # 一度の insert_many でまとめて挿入する
+        await db.bulk_insert("reviews", [
+            {
+                "company_id": company_id,
                 "user_id": f"user_{i}",
                 "employment_status": "former",
                 "ratings": {
@@ -200,7 +178,9 @@ class TestReviewAggregationService:
                 "created_at": review_date,
                 "updated_at": review_date,
                 "language": "ja"
-            })
+            }
+            for i, review_date in enumerate(review_dates)
+        ])
 
         # 集計実行
         result = await service.aggregate_company_reviews(str(company_id))
@@ -216,6 +196,84 @@ class TestReviewAggregationService:
         # 最終レビュー日時（MongoDBからはタイムゾーンなしで返ってくるため、日時のみで比較）
         assert result["last_review_date"].replace(tzinfo=None) == review_dates[2].replace(tzinfo=None)
 
+    @pytest.mark.asyncio
+    async def test_aggregate_company_reviews_excludes_none_ratings(self, service_and_db):
+        """None値（未回答）の評価はカテゴリ別平均から除外される"""
+        service, db = service_and_db
+        company_id = str(ObjectId())
+
+        ratings_list = [
+            {
+                "recommendation": 4,
+                "foreign_support": None,
+                "company_culture": 3,
+                "employee_relations": 5,
+                "evaluation_system": None,
+                "promotion_treatment": 4
+            },
+            {
+                "recommendation": 5,
+                "foreign_support": 2,
+                "company_culture": None,
+                "employee_relations": 4,
+                "evaluation_system": 3,
+                "promotion_treatment": None
+            }
+        ]
+        await db.bulk_insert("reviews", [
+            {
+                "company_id": company_id,
+                "user_id": f"user_{i}",
+                "ratings": ratings,
+                "is_active": True,
+                "created_at": datetime.now(timezone.utc),
+                "updated_at": datetime.now(timezone.utc)
+            }
+            for i, ratings in enumerate(ratings_list)
+        ])
+
+        averages = (await service.aggregate_company_reviews(company_id))["category_averages"]
+
+        # recommendation: (4 + 5) / 2 = 4.5
+        assert averages["recommendation"] == 4.5
+        # foreign_support: 2 / 1 = 2.0（None除外）
+        assert averages["foreign_support"] == 2.0
+        # company_culture: 3 / 1 = 3.0（None除外）
+        assert averages["company_culture"] == 3.0
+        # employee_relations: (5 + 4) / 2 = 4.5
+        assert averages["employee_relations"] == 4.5
+        # evaluation_system: 3 / 1 = 3.0（None除外）
+        assert averages["evaluation_system"] == 3.0
+        # promotion_treatment: 4 / 1 = 4.0（None除外）
+        assert averages["promotion_treatment"] == 4.0
+
+    @pytest.mark.asyncio
+    async def test_aggregate_company_reviews_all_none_ratings(self, service_and_db):
+        """すべてNoneのカテゴリは0.0になる"""
+        service, db = service_and_db
+        company_id = str(ObjectId())
+
+        await db.create("reviews", {
+            "company_id": company_id,
+            "user_id": "user_1",
+            "ratings": {
+                "recommendation": None,
+                "foreign_support": None,
+                "company_culture": None,
+                "employee_relations": None,
+                "evaluation_system": None,
+                "promotion_treatment": None
+            },
+            "is_active": True,
+            "created_at": datetime.now(timezone.utc),
+            "updated_at": datetime.now(timezone.utc)
+        })
+
+        averages = (await service.aggregate_company_reviews(company_id))["category_averages"]
+
+        for category, value in averages.items():
+            assert value == 0.0, f"Category {category} should be 0.0 when all values are None"
+
     @pytest.mark.asyncio
     async def test_aggregate_excludes_inactive_reviews(self, service_and_db):
         """is_active=False のレビューは集計から除外される"""
@@ -232,37 +290,49 @@ class TestReviewAggregationService:
             "updated_at": datetime.now(timezone.utc)
         })
 
-        # アクティブなレビューを1件作成
-        await db.create("reviews", {
-            "company_id": ObjectId(company_id),
-            "user_id": "user_1",
-            "employment_status": "former",
-            "ratings": {"recommendation": 5, "foreign_support": 5, "company_culture": 5,
-                       "employee_relations": 5, "evaluation_system": 5, "promotion_treatment": 5},
-            "comments": {},
-            "individual_average": 5.0,
-            "answered_count": 6,
-            "is_active": True,
-            "created_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc),
-            "language": "ja"
-        })
-
-        # 非アクティブなレビューを1件作成（集計対象外）
-        await db.create("reviews", {
-            "company_id": ObjectId(company_id),
-            "user_id": "user_2",
-            "employment_status": "former",
-            "ratings": {"recommendation": 1, "foreign_support": 1, "company_culture": 1,
-                       "employee_relations": 1, "evaluation_system": 1, "promotion_treatment": 1},
-            "comments": {},
-            "individual_average": 1.0,
-            "answered_count": 6,
-            "is_active": False,  # 非アクティブ
-            "created_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc),
-            "language": "ja"
-        })
+        # アクティブなレビュー1件と非アクティブなレビュー1件（集計対象外）をまとめて作成
+        await db.bulk_insert("reviews", [
+            {
+                "company_id": company_id,
+                "user_id": "user_1",
+                "employment_status": "former",
+                "ratings": {
+                    "recommendation": 5,
+                    "foreign_support": 5,
+                    "company_culture": 5,
+                    "employee_relations": 5,
+                    "evaluation_system": 5,
+                    "promotion_treatment": 5,
+                },
+                "comments": {},
+                "individual_average": 5.0,
+                "answered_count": 6,
+                "is_active": True,
+                "created_at": datetime.now(timezone.utc),
+                "updated_at": datetime.now(timezone.utc),
+                "language": "ja"
+            },
+            {
+                "company_id": company_id,
+                "user_id": "user_2",
+                "employment_status": "former",
+                "ratings": {
+                    "recommendation": 1,
+                    "foreign_support": 1,
+                    "company_culture": 1,
+                    "employee_relations": 1,
+                    "evaluation_system": 1,
+                    "promotion_treatment": 1,
+                },
+                "comments": {},
+                "individual_average": 1.0,
+                "answered_count": 6,
+                "is_active": False,  # 非アクティブ
+                "created_at": datetime.now(timezone.utc),
+                "updated_at": datetime.now(timezone.utc),
+                "language": "ja"
+            }
+        ])
 
         # 集計実行
         result = await service.aggregate_company_reviews(str(company_id))
@@ -289,7 +359,7 @@ class TestReviewAggregationService:
 
         # レビューを作成
         await db.create("reviews", {
-            "company_id": ObjectId(company_id),
+            "company_id": company_id,
             "user_id": "user_1",
             "employment_status": "former",
             "ratings": {
@@ -342,7 +412,7 @@ class TestReviewAggregationService:
 
         # レビューを作成
         await db.create("reviews", {
-            "company_id": ObjectId(company_id),
+            "company_id": company_id,
             "user_id": "user_1",
             "employment_status": "former",
             "ratings": {
@@ -367,11 +437,18 @@ class TestReviewAggregationService:
         company1 = await db.find_one("companies", {"_id": ObjectId(company_id)})
 
         # 2回目の集計（冪等性の確認）
-        result2 = await service.aggregate_and_update_company(str(company_id))
+        with patch.object(
+            service, "aggregate_company_reviews", wraps=service.aggregate_company_reviews
+        ) as aggregate_spy:
+            result2 = await service.aggregate_and_update_company(str(company_id))
         company2 = await db.find_one("companies", {"_id": ObjectId(company_id)})
 
         assert result1["success"] is True
+        assert result1["updated"] is True
         assert result2["success"] is True
+        # レビューが変わっていないため、2回目は再集計も企業レコードの更新も行わない
+        aggregate_spy.assert_not_called()
+        assert result2["updated"] is False
 
         # 集計結果は同じであることを確認
         assert company1["review_summary"]["total_reviews"] == company2["review_summary"]["total_reviews"]
@@ -389,3 +466,78 @@ class TestReviewAggregationService:
         # エラーが適切に処理されることを確認
         assert result["success"] is True  # 集計自体は成功（レビューが0件）
         assert result["total_reviews"] == 0
+
+    @pytest.mark.asyncio
+    async def test_create_review_aggregation_indexes(self):
+        """集計クエリ用の複合インデックス（company_id + is_active + created_at）が作成される"""
+        mock_db = MagicMock()
+        mock_db.create_index = AsyncMock(return_value="index_name")
+        service = ReviewAggregationService(mock_db)
+
+        result = await service.create_review_aggregation_indexes()
+
+        assert result is True
+        mock_db.create_index.assert_awaited_once_with(
+            "reviews",
+            [("company_id", 1), ("is_active", 1), ("created_at", -1)]
+        )
+
+    @pytest.mark.asyncio
+    async def test_aggregation_query_uses_index(self, service_and_db):
+        """集計クエリの $match 条件がインデックスで解決される（IXSCAN）"""
+        service, db = service_and_db
+        assert await service.create_review_aggregation_indexes() is True
+
+        plan = await db.db["reviews"].find(
+            {"company_id": "000000000000000000000000", "is_active": True}
+        ).explain()
+
+        assert "IXSCAN" in str(plan["queryPlanner"]["winningPlan"])
+
+    @pytest.mark.asyncio
+    async def test_unchanged_source_state_skips_update(self):
+        """集計元の状態が保存済みの状態と一致すれば再集計・更新を行わない"""
+        mock_db = _mock_db([_SOURCE_STATE], _SOURCE_STATE)
+        service = ReviewAggregationService(mock_db)
+
+        result = await service.aggregate_and_update_company(_COMPANY_ID)
+
+        assert result["success"] is True
+        assert result["updated"] is False
+        mock_db.update_one.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_force_recomputes_unchanged_company(self):
+        """force=True の場合は集計元の状態が変わっていなくても再集計する"""
+        mock_db = _mock_db([_SOURCE_STATE], _SOURCE_STATE)
+        service = ReviewAggregationService(mock_db)
+
+        result = await service.aggregate_and_update_company(_COMPANY_ID, force=True)
+
+        assert result["updated"] is True
+        mock_db.update_one.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_source_state_query_recomputes(self):
+        """状態の取得結果が空（取得失敗を含む）の場合は変更ありとみなして再集計する"""
+        empty_state = {"review_count": 0, "active_count": 0, "last_modified": None}
+        mock_db = _mock_db([], empty_state)
+        service = ReviewAggregationService(mock_db)
+
+        result = await service.aggregate_and_update_company(_COMPANY_ID)
+
+        assert result["updated"] is True
+        mock_db.update_one.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_is_active_toggle_recomputes(self):
+        """updated_at を変えずに is_active だけが切り替わった場合も再集計する"""
+        toggled_state = {**_SOURCE_STATE, "active_count": 1}
+        mock_db = _mock_db([toggled_state], _SOURCE_STATE)
+        service = ReviewAggregationService(mock_db)
+
+        result = await service.aggregate_and_update_company(_COMPANY_ID)
+
+        assert result["updated"] is True
+        _, _, update = mock_db.update_one.await_args.args
+        assert update["$set"]["review_summary"]["source_state"] == toggled_state
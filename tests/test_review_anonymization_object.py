@@ -6,13 +6,35 @@ from datetime import datetime
 from src.services.review_anonymization_service import ReviewAnonymizationService
 from src.models.review import Review, EmploymentStatus, EmploymentPeriod
 
+# 日時そのものは検証しないテストで使う作成・更新日時（実時刻には依存しない固定値）
+_FIXED_NOW = datetime(2024, 1, 1, 0, 0, 0)
+
+
+def _make_review(**overrides):
+    """テスト用のレビューを生成（既定値から指定したフィールドだけを差し替える）"""
+    fields = {
+        "id": "review123",
+        "company_id": "company456",
+        "user_id": "user789",
+        "employment_status": EmploymentStatus.CURRENT,
+        "ratings": {"recommendation": 4},
+        "comments": {"recommendation": "Good"},
+        "individual_average": 4.0,
+        "answered_count": 1,
+        "created_at": _FIXED_NOW,
+        "updated_at": _FIXED_NOW,
+        "is_active": True
+    }
+    fields.update(overrides)
+    return Review(**fields)
+
 
 class TestReviewObjectAnonymization:
     """レビューオブジェクト匿名化機能のテストクラス"""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def service(self):
-        """匿名化サービスのインスタンスを提供"""
+        """匿名化サービスのインスタンスを提供（テストから変更されないため、モジュール内で共有する）"""
         return ReviewAnonymizationService()
 
     @pytest.fixture
@@ -103,19 +125,9 @@ class TestReviewObjectAnonymization:
 
     def test_anonymize_review_employment_period_with_end_year(self, service):
         """終了年がある勤務期間が正しく処理されることを確認"""
-        review = Review(
-            id="review123",
-            company_id="company456",
-            user_id="user789",
+        review = _make_review(
             employment_status=EmploymentStatus.FORMER,
-            employment_period=EmploymentPeriod(start_year=2018, end_year=2022),
-            ratings={"recommendation": 4},
-            comments={"recommendation": "Good"},
-            individual_average=4.0,
-            answered_count=1,
-            created_at=datetime.now(),
-            updated_at=datetime.now(),
-            is_active=True
+            employment_period=EmploymentPeriod(start_year=2018, end_year=2022)
         )
 
         result = service.anonymize_review(review)
@@ -126,19 +138,11 @@ class TestReviewObjectAnonymization:
 
     def test_anonymize_review_employment_period_current(self, service):
         """現在勤務中の勤務期間が正しく処理されることを確認"""
-        review = Review(
-            id="review123",
-            company_id="company456",
-            user_id="user789",
-            employment_status=EmploymentStatus.CURRENT,
+        review = _make_review(
             employment_period=EmploymentPeriod(start_year=2020, end_year=None),
             ratings={"recommendation": 5},
             comments={"recommendation": "Excellent"},
-            individual_average=5.0,
-            answered_count=1,
-            created_at=datetime.now(),
-            updated_at=datetime.now(),
-            is_active=True
+            individual_average=5.0
         )
 
         result = service.anonymize_review(review)
@@ -149,19 +153,11 @@ class TestReviewObjectAnonymization:
 
     def test_anonymize_review_without_employment_period(self, service):
         """勤務期間が未設定のレビューが正しく処理されることを確認"""
-        review = Review(
-            id="review123",
-            company_id="company456",
-            user_id="user789",
-            employment_status=EmploymentStatus.CURRENT,
+        review = _make_review(
             employment_period=None,
             ratings={"recommendation": 3},
             comments={"recommendation": "OK"},
-            individual_average=3.0,
-            answered_count=1,
-            created_at=datetime.now(),
-            updated_at=datetime.now(),
-            is_active=True
+            individual_average=3.0
         )
 
         result = service.anonymize_review(review)
@@ -210,19 +206,9 @@ class TestReviewObjectAnonymization:
 
     def test_anonymize_review_multilingual_comments(self, service):
         """多言語コメントが正しく処理されることを確認"""
-        review = Review(
-            id="review123",
-            company_id="company456",
-            user_id="user789",
-            employment_status=EmploymentStatus.CURRENT,
+        review = _make_review(
             employment_period=EmploymentPeriod(start_year=2020, end_year=None),
-            ratings={"recommendation": 4},
             comments={"recommendation": "Great company"},
-            individual_average=4.0,
-            answered_count=1,
-            created_at=datetime.now(),
-            updated_at=datetime.now(),
-            is_active=True,
             language="en",
             comments_ja={"recommendation": "素晴らしい会社"},
             comments_zh={"recommendation": "很棒的公司"},
@@ -243,18 +229,8 @@ class TestReviewObjectAnonymization:
 
     def test_anonymize_review_preview_mode_multilingual(self, service):
         """プレビューモードで多言語コメントもマスキングされることを確認"""
-        review = Review(
-            id="review123",
-            company_id="company456",
-            user_id="user789",
-            employment_status=EmploymentStatus.CURRENT,
-            ratings={"recommendation": 4},
+        review = _make_review(
             comments={"recommendation": "Great"},
-            individual_average=4.0,
-            answered_count=1,
-            created_at=datetime.now(),
-            updated_at=datetime.now(),
-            is_active=True,
             language="en",
             comments_ja={"recommendation": "素晴らしい"},
             comments_zh={"recommendation": "很棒"},
@@ -4,6 +4,22 @@
 import pytest
 from src.services.review_anonymization_service import ReviewAnonymizationService
 
+# (ソルト, user_id) -> 期待する匿名化表示
+# SHA-256(user_id + salt) の先頭8桁を26で割った余りから求めた値
+# （アルゴリズムの変更を検出するために固定する）
+_EXPECTED_LABELS = {
+    ("", "user123"): "ユーザーZ",
+    ("", "user456"): "ユーザーK",
+    ("", "ユーザー123"): "ユーザーB",
+    ("", "用户456"): "ユーザーW",
+    ("", ""): "ユーザーY",
+    ("salt1", "user123"): "ユーザーI",
+    ("salt1", "user456"): "ユーザーB",
+    ("salt1", "user@example.com"): "ユーザーQ",
+    ("salt2", "user123"): "ユーザーN",
+    ("salt2", "user456"): "ユーザーJ",
+}
+
 
 class TestReviewAnonymizationService:
     """ReviewAnonymizationServiceのテストクラス"""
@@ -42,6 +58,26 @@ class TestReviewAnonymizationService:
         # このテストは統計的に正しいが、稀に失敗する可能性がある
         assert result1 != result2, "異なるuser_idで同じ匿名化表示が生成された（衝突）"
 
+    def test_anonymize_user_id_matches_known_labels(self):
+        """既知の (ソルト, user_id) の組み合わせが固定の匿名化表示になることを確認"""
+        services = {}
+        for (salt, user_id), expected in _EXPECTED_LABELS.items():
+            service = services.setdefault(salt, ReviewAnonymizationService(salt=salt))
+            assert service.anonymize_user_id(user_id) == expected, \
+                f"({salt!r}, {user_id!r}) の匿名化表示が変わった"
+
+    def test_anonymize_user_id_cache_is_bounded(self):
+        """匿名化表示のキャッシュが上限数を超えて増えず、破棄後も同じ表示を返すことを確認"""
+        service = ReviewAnonymizationService()
+        service.ANONYMIZED_CACHE_SIZE = 2
+        expected = {
+            user_id: service.anonymize_user_id(user_id) for user_id in ("user1", "user2", "user3")
+        }
+
+        assert len(service._anonymized_cache) <= 2
+        for user_id, anonymized in expected.items():
+            assert service.anonymize_user_id(user_id) == anonymized
+
     def test_anonymize_user_id_with_salt(self):
         """ソルトを変更すると異なる匿名化表示になることを確認"""
         service1 = ReviewAnonymizationService(salt="salt1")
@@ -72,6 +108,22 @@ class TestReviewAnonymizationService:
         # 16進数文字列であることを確認
         assert all(c in '0123456789abcdef' for c in result), "16進数文字列ではない"
 
+    def test_digest_to_letter_matches_hash_to_letter(self):
+        """_digest_to_letter がダイジェストから _hash_to_letter と同じ文字を返すことを確認"""
+        service = ReviewAnonymizationService(salt="salt1")
+
+        for user_id in ("user123", "user456", "ユーザー789", ""):
+            digest = service._digest_user_id(user_id)
+            assert service._digest_to_letter(digest) == service._hash_to_letter(digest.hex())
+
+    def test_digest_user_id_accepts_encoded_bytes(self):
+        """UTF-8エンコード済みのuser_idでも文字列と同じダイジェストになることを確認"""
+        service = ReviewAnonymizationService(salt="salt1")
+
+        for user_id in ("user123", "ユーザー789", ""):
+            encoded = user_id.encode('utf-8')
+            assert service._digest_user_id(encoded) == service._digest_user_id(user_id)
+
     def test_hash_to_letter_returns_single_uppercase_letter(self):
         """_hash_to_letter がA-Zの1文字を返すことを確認"""
         service = ReviewAnonymizationService()
@@ -3,25 +3,67 @@
 TDD Green Phase: 認証機能確認
 """
 import pytest
-from unittest.mock import AsyncMock, Mock
+from dataclasses import dataclass
+from types import SimpleNamespace
 from src.services.review_submission_service import ReviewSubmissionService
 from src.middleware.auth_middleware import AuthMiddleware
 
 
+@dataclass
+class _StubResult:
+    """セッション検証結果のスタブ"""
+    is_success: bool
+
+
+class _StubSessionService:
+    """validate_session が固定の結果を返すセッションサービス（呼び出し回数を記録）"""
+
+    def __init__(self, result=None):
+        self._result = result
+        self.validate_calls = 0
+
+    async def validate_session(self, session_id):
+        self.validate_calls += 1
+        return self._result
+
+
+class _StubDBService:
+    """find_one が固定のドキュメントを返すデータベースサービス（呼び出し回数を記録）"""
+
+    def __init__(self, document=None):
+        self._document = document
+        self.find_one_calls = 0
+
+    async def find_one(self, collection, filter_dict):
+        self.find_one_calls += 1
+        return self._document
+
+    async def bulk_update(self, collection, updates):
+        return len(updates)
+
+
+def _stub_user_service(user_doc):
+    """db_service.find_one が user_doc を返すユーザーサービス"""
+    return SimpleNamespace(db_service=_StubDBService(user_doc))
+
+
+@pytest.fixture
+def auth_middleware():
+    """スタブのデータベース・セッションサービスを使う認証ミドルウェア（テストごとに生成）"""
+    middleware = AuthMiddleware(db_service=_StubDBService())
+    middleware.session_service = _StubSessionService()
+    return middleware
+
+
 class TestReviewAuthenticationService:
     """レビュー認証統合テスト"""
 
     @pytest.mark.asyncio
-    async def test_validate_session_token_valid(self):
+    async def test_validate_session_token_valid(self, auth_middleware):
         """有効なセッショントークンの検証テスト"""
         # Given: 認証ミドルウェアと有効なトークン
-        auth_middleware = AuthMiddleware()
-        auth_middleware.session_service = AsyncMock()
-
-        # セッション検証が成功するようにモック設定
-        mock_result = AsyncMock()
-        mock_result.is_success = True
-        auth_middleware.session_service.validate_session.return_value = mock_result
+        # セッション検証が成功するようにスタブを設定
+        auth_middleware.session_service = _StubSessionService(_StubResult(is_success=True))
 
         # When: トークンを検証
         result = await auth_middleware.validate_session_token("valid_token_123")
@@ -30,16 +72,11 @@ class TestReviewAuthenticationService:
         assert result is True
 
     @pytest.mark.asyncio
-    async def test_validate_session_token_invalid(self):
+    async def test_validate_session_token_invalid(self, auth_middleware):
         """無効なセッショントークンの検証テスト"""
         # Given: 認証ミドルウェアと無効なトークン
-        auth_middleware = AuthMiddleware()
-        auth_middleware.session_service = AsyncMock()
-
-        # セッション検証が失敗するようにモック設定
-        mock_result = AsyncMock()
-        mock_result.is_success = False
-        auth_middleware.session_service.validate_session.return_value = mock_result
+        # セッション検証が失敗するようにスタブを設定
+        auth_middleware.session_service = _StubSessionService(_StubResult(is_success=False))
 
         # When: 無効なトークンを検証
         result = await auth_middleware.validate_session_token("invalid_token")
@@ -48,11 +85,9 @@ class TestReviewAuthenticationService:
         assert result is False
 
     @pytest.mark.asyncio
-    async def test_validate_session_token_empty(self):
+    async def test_validate_session_token_empty(self, auth_middleware):
         """空のセッショントークンの検証テスト"""
         # Given: 認証ミドルウェアと空のトークン
-        auth_middleware = AuthMiddleware()
-
         # When: 空のトークンを検証
         result = await auth_middleware.validate_session_token("")
 
@@ -60,12 +95,21 @@ class TestReviewAuthenticationService:
         assert result is False
 
     @pytest.mark.asyncio
-    async def test_get_user_from_session_dict_valid(self):
+    async def test_validate_session_token_whitespace_skips_session_lookup(self, auth_middleware):
+        """空白のみのセッショントークンはセッション検証を行わずに無効と判定されるテスト"""
+        # Given: 認証ミドルウェアと空白のみのトークン
+
+        # When: 空白のみのトークンを検証
+        result = await auth_middleware.validate_session_token("   ")
+
+        # Then: 無効と判定され、セッション検証は呼ばれない
+        assert result is False
+        assert auth_middleware.session_service.validate_calls == 0
+
+    @pytest.mark.asyncio
+    async def test_get_user_from_session_dict_valid(self, auth_middleware):
         """有効なセッション辞書からのユーザー情報取得テスト"""
         # Given: 認証ミドルウェアと有効なセッションデータ
-        auth_middleware = AuthMiddleware()
-        auth_middleware.user_service = AsyncMock()
-
         session_data = {
             "user_id": "user123",
             "email": "test@example.com",
@@ -82,8 +126,7 @@ class TestReviewAuthenticationService:
             "is_active": True
         }
 
-        auth_middleware.user_service.db_service = AsyncMock()
-        auth_middleware.user_service.db_service.find_one.return_value = user_doc
+        auth_middleware.user_service = _stub_user_service(user_doc)
 
         # When: セッション辞書からユーザー情報を取得
         result = await auth_middleware.get_user_from_session_dict(session_data)
@@ -95,12 +138,9 @@ class TestReviewAuthenticationService:
         assert result["name"] == "Test User"
 
     @pytest.mark.asyncio
-    async def test_get_user_from_session_dict_inactive_user(self):
+    async def test_get_user_from_session_dict_inactive_user(self, auth_middleware):
         """非アクティブユーザーのセッション処理テスト"""
         # Given: 非アクティブなユーザーのセッションデータ
-        auth_middleware = AuthMiddleware()
-        auth_middleware.user_service = AsyncMock()
-
         session_data = {
             "user_id": "inactive_user",
             "email": "inactive@example.com"
@@ -112,8 +152,7 @@ class TestReviewAuthenticationService:
             "is_active": False  # 非アクティブ
         }
 
-        auth_middleware.user_service.db_service = AsyncMock()
-        auth_middleware.user_service.db_service.find_one.return_value = user_doc
+        auth_middleware.user_service = _stub_user_service(user_doc)
 
         # When: 非アクティブユーザーの情報を取得試行
         result = await auth_middleware.get_user_from_session_dict(session_data)
@@ -122,19 +161,15 @@ class TestReviewAuthenticationService:
         assert result is None
 
     @pytest.mark.asyncio
-    async def test_get_user_from_session_dict_user_not_found(self):
+    async def test_get_user_from_session_dict_user_not_found(self, auth_middleware):
         """存在しないユーザーのセッション処理テスト"""
         # Given: 存在しないユーザーのセッションデータ
-        auth_middleware = AuthMiddleware()
-        auth_middleware.user_service = AsyncMock()
-
         session_data = {
             "user_id": "nonexistent_user"
         }
 
         # ユーザーが見つからない
-        auth_middleware.user_service.db_service = AsyncMock()
-        auth_middleware.user_service.db_service.find_one.return_value = None
+        auth_middleware.user_service = _stub_user_service(None)
 
         # When: 存在しないユーザーの情報を取得試行
         result = await auth_middleware.get_user_from_session_dict(session_data)
@@ -143,11 +178,68 @@ class TestReviewAuthenticationService:
         assert result is None
 
     @pytest.mark.asyncio
-    async def test_get_user_from_session_dict_empty_session(self):
+    async def test_get_user_from_session_dict_uses_cache_until_invalidated(self, auth_middleware):
+        """取得済みユーザーはキャッシュから返され、破棄後は再取得されるテスト"""
+        # Given: アクティブなユーザーのセッションデータ
+        auth_middleware.user_service = _stub_user_service({
+            "_id": "user123",
+            "email": "test@example.com",
+            "name": "Test User",
+            "is_active": True
+        })
+        session_data = {"user_id": "user123"}
+
+        # When: 同じユーザーの情報を2回取得
+        first = await auth_middleware.get_user_from_session_dict(session_data)
+        second = await auth_middleware.get_user_from_session_dict(session_data)
+
+        # Then: データベースへの問い合わせは1回だけ
+        assert first == second
+        assert auth_middleware.user_service.db_service.find_one_calls == 1
+
+        # When: キャッシュを破棄して再取得
+        auth_middleware.invalidate_user("user123")
+        await auth_middleware.get_user_from_session_dict(session_data)
+
+        # Then: データベースから再取得される
+        assert auth_middleware.user_service.db_service.find_one_calls == 2
+
+    @pytest.mark.asyncio
+    async def test_get_user_from_session_dict_misses_cache_after_deactivation(self):
+        """ミドルウェアのユーザーサービスで無効化するとキャッシュが破棄されるテスト"""
+        # Given: キャッシュ済みのアクティブなユーザー
+        db_service = _StubDBService({"_id": "user123", "is_active": True})
+        auth_middleware = AuthMiddleware(db_service=db_service)
+        session_data = {"user_id": "user123"}
+        assert await auth_middleware.get_user_from_session_dict(session_data) is not None
+
+        # When: ユーザーを無効化（データベース上も非アクティブになる）
+        await auth_middleware.user_service.bulk_update_user_status(["user123"], False)
+        db_service._document = {"_id": "user123", "is_active": False}
+        result = await auth_middleware.get_user_from_session_dict(session_data)
+
+        # Then: キャッシュから返されず、データベースから再取得して None となる
+        assert result is None
+        assert db_service.find_one_calls == 2
+
+    @pytest.mark.asyncio
+    async def test_user_cache_evicts_oldest_entry_when_full(self, auth_middleware):
+        """キャッシュが上限に達すると最も古いエントリだけが追い出されるテスト"""
+        # Given: 上限2件のキャッシュ
+        auth_middleware.USER_CACHE_SIZE = 2
+        auth_middleware.user_service = _stub_user_service({"_id": "user", "is_active": True})
+
+        # When: 3人分のユーザー情報を取得
+        for user_id in ("user1", "user2", "user3"):
+            await auth_middleware.get_user_from_session_dict({"user_id": user_id})
+
+        # Then: 最も古い user1 だけが追い出される
+        assert list(auth_middleware._user_cache) == ["user2", "user3"]
+
+    @pytest.mark.asyncio
+    async def test_get_user_from_session_dict_empty_session(self, auth_middleware):
         """空のセッションデータの処理テスト"""
         # Given: 空のセッションデータ
-        auth_middleware = AuthMiddleware()
-
         # When: 空のセッションからユーザー情報を取得試行
         result = await auth_middleware.get_user_from_session_dict({})
 
@@ -163,14 +255,12 @@ class TestReviewPermissionIntegration:
         """認証とレビュー投稿権限の統合テスト"""
         # Given: 認証されたユーザーと投稿制限チェック
         service = ReviewSubmissionService()
-        mock_db = AsyncMock()
-        service.db = mock_db
 
         user_id = "authenticated_user_123"
         company_id = "company_456"
 
         # 既存レビューなし（新規投稿可能）
-        mock_db.find_one.return_value = None
+        service.db = _StubDBService(None)
 
         # When: 投稿権限をチェック
         permission = await service.validate_review_permissions(user_id, company_id)
@@ -186,8 +276,6 @@ class TestReviewPermissionIntegration:
         """認証とレビュー編集権限の統合テスト"""
         # Given: 認証されたユーザーと自分のレビュー
         service = ReviewSubmissionService()
-        mock_db = AsyncMock()
-        service.db = mock_db
 
         user_id = "authenticated_user_123"
         review_id = "review_789"
@@ -201,7 +289,7 @@ class TestReviewPermissionIntegration:
             "is_active": True
         }
 
-        mock_db.find_one.return_value = review_data
+        service.db = _StubDBService(review_data)
 
         # When: 編集権限をチェック
         can_edit = await service.check_edit_permission(user_id, review_id)
@@ -214,8 +302,6 @@ class TestReviewPermissionIntegration:
         """異なるユーザーのレビュー編集権限拒否テスト"""
         # Given: 他のユーザーのレビューに対する編集試行
         service = ReviewSubmissionService()
-        mock_db = AsyncMock()
-        service.db = mock_db
 
         requesting_user_id = "user_A"
         review_owner_id = "user_B"
@@ -230,7 +316,7 @@ class TestReviewPermissionIntegration:
             "is_active": True
         }
 
-        mock_db.find_one.return_value = review_data
+        service.db = _StubDBService(review_data)
 
         # When: 異なるユーザーが編集権限をチェック
         can_edit = await service.check_edit_permission(requesting_user_id, review_id)
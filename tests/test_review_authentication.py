@@ -8,76 +8,93 @@ import tornado.testing
 import tornado.web
 from datetime import datetime, timedelta
 from src.handlers.review_handler import ReviewCreateHandler, ReviewEditHandler
+from src.middleware.auth_middleware import AuthMiddleware
 from src.services.review_submission_service import ReviewSubmissionService
 
 
-class TestReviewAuthentication:
-    """レビュー認証機能のテスト"""
+@pytest.fixture(scope="module")
+def now():
+    """モジュール共通の現在時刻（サービス側が実時刻と比較するため、固定の日付ではなく一度だけ取得する）"""
+    return datetime.utcnow()
 
-    @pytest.mark.asyncio
-    async def test_authentication_required_for_review_creation(self):
-        """レビュー投稿に認証が必要なテスト"""
-        # Given: 未認証のユーザー
-        mock_app = Mock()
-        mock_request = Mock()
-        handler = ReviewCreateHandler(mock_app, mock_request)
-        handler.get_current_user_id = Mock(return_value=None)
 
-        # When: レビュー投稿を試行
-        with pytest.raises(tornado.web.HTTPError) as exc_info:
-            await handler.post("company123")
+# ハンドラー生成用のアプリケーション・リクエスト（全テストで共有する）
+# RequestHandler.__init__ は ui_methods / ui_modules を走査するため、空の辞書を持たせておく
+_MOCK_APP = Mock(ui_methods={}, ui_modules={})
+_MOCK_REQUEST = Mock()
 
-        # Then: 401エラーが発生
-        assert exc_info.value.status_code == 401
+
+@pytest.fixture
+def review_service_mock():
+    """共通の戻り値を設定したレビュー投稿サービスのモック（テストごとに生成）"""
+    mock = AsyncMock(spec=ReviewSubmissionService)
+    mock.check_review_permission.return_value = {"can_create": True}
+    mock.submit_review.return_value = {"status": "success"}
+    return mock
+
+
+def _make_handler(handler_cls, user_id):
+    """共有のアプリケーション・リクエストでハンドラーを生成し、ログイン中のユーザーIDを固定する"""
+    handler = handler_cls(_MOCK_APP, _MOCK_REQUEST)
+    handler.get_current_user_id = Mock(return_value=user_id)
+    return handler
+
+
+# レビュー投稿フォームの送信内容（フィールド名 -> 値）
+_FORM_DATA = {
+    "employment_status": "former",
+    "ratings[recommendation]": "4",
+    "ratings[foreign_support]": "3",
+    "ratings[company_culture]": "no_answer",
+    "ratings[employee_relations]": "5",
+    "ratings[evaluation_system]": "no_answer",
+    "ratings[promotion_treatment]": "2",
+    "comments[recommendation]": "Good company",
+    "comments[foreign_support]": "",
+    "comments[company_culture]": "",
+    "comments[employee_relations]": "Great colleagues",
+    "comments[evaluation_system]": "",
+    "comments[promotion_treatment]": "Limited opportunities"
+}
+
+
+class TestReviewAuthentication:
+    """レビュー認証機能のテスト"""
 
     @pytest.mark.asyncio
-    async def test_authentication_required_for_review_editing(self):
-        """レビュー編集に認証が必要なテスト"""
+    @pytest.mark.parametrize('handler_cls,method,route_arg,cookie_expired', [
+        # レビュー投稿
+        pytest.param(ReviewCreateHandler, 'post', "company123", False, id='review_creation'),
+        # レビュー編集
+        pytest.param(ReviewEditHandler, 'get', "review123", False, id='review_editing'),
+        # 期限切れセッション（Cookie が取得できない）でのレビュー投稿
+        pytest.param(ReviewCreateHandler, 'post', "company123", True, id='expired_session'),
+    ])
+    async def test_authentication_required(self, handler_cls, method, route_arg, cookie_expired):
+        """未認証ユーザーのレビュー投稿・編集に認証が必要なテスト"""
         # Given: 未認証のユーザー
-        mock_app = Mock()
-        mock_request = Mock()
-        handler = ReviewEditHandler(mock_app, mock_request)
-        handler.get_current_user_id = Mock(return_value=None)
+        handler = _make_handler(handler_cls, None)
+        if cookie_expired:
+            handler.get_secure_cookie = Mock(return_value=None)
 
-        # When: レビュー編集を試行
+        # When: レビュー投稿・編集を試行
         with pytest.raises(tornado.web.HTTPError) as exc_info:
-            await handler.get("review123")
+            await getattr(handler, method)(route_arg)
 
         # Then: 401エラーが発生
         assert exc_info.value.status_code == 401
 
     @pytest.mark.asyncio
-    async def test_authenticated_user_can_create_review(self):
+    async def test_authenticated_user_can_create_review(self, review_service_mock):
         """認証されたユーザーはレビューを投稿できるテスト"""
         # Given: 認証されたユーザー
-        mock_app = Mock()
-        mock_request = Mock()
-        handler = ReviewCreateHandler(mock_app, mock_request)
-        handler.get_current_user_id = Mock(return_value="authenticated_user_123")
-        handler.review_service = AsyncMock(spec=ReviewSubmissionService)
+        handler = _make_handler(ReviewCreateHandler, "authenticated_user_123")
+        handler.review_service = review_service_mock
         handler.get_argument = Mock()
         handler.redirect = Mock()
 
-        # モックサービスの設定
-        handler.review_service.check_review_permission.return_value = {"can_create": True}
-        handler.review_service.submit_review.return_value = {"status": "success"}
-
-        # フォームデータをモック
-        handler.get_argument.side_effect = lambda key, default=None: {
-            "employment_status": "former",
-            "ratings[recommendation]": "4",
-            "ratings[foreign_support]": "3",
-            "ratings[company_culture]": "no_answer",
-            "ratings[employee_relations]": "5",
-            "ratings[evaluation_system]": "no_answer",
-            "ratings[promotion_treatment]": "2",
-            "comments[recommendation]": "Good company",
-            "comments[foreign_support]": "",
-            "comments[company_culture]": "",
-            "comments[employee_relations]": "Great colleagues",
-            "comments[evaluation_system]": "",
-            "comments[promotion_treatment]": "Limited opportunities"
-        }.get(key, default)
+        # フォームデータをモック（get_argument は位置引数で呼ばれるため dict.get をそのまま使う）
+        handler.get_argument.side_effect = _FORM_DATA.get
 
         # When: レビュー投稿
         await handler.post("company123")
@@ -87,12 +104,11 @@ class TestReviewAuthentication:
         handler.redirect.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_user_can_only_edit_own_reviews(self):
+    async def test_user_can_only_edit_own_reviews(self, review_service_mock):
         """ユーザーは自分のレビューのみ編集できるテスト"""
         # Given: 他のユーザーのレビュー
-        handler = ReviewEditHandler()
-        handler.get_current_user_id = Mock(return_value="user456")
-        handler.review_service = AsyncMock(spec=ReviewSubmissionService)
+        handler = _make_handler(ReviewEditHandler, "user456")
+        handler.review_service = review_service_mock
 
         # 他のユーザーのレビューに対して編集権限なし
         handler.review_service.check_edit_permission.return_value = False
@@ -108,11 +124,10 @@ class TestReviewAuthentication:
     async def test_user_session_persistence(self):
         """ユーザーセッションの永続性テスト"""
         # Given: 有効なセッションを持つユーザー
-        handler = ReviewCreateHandler()
+        handler = _make_handler(ReviewCreateHandler, "user123")
 
         # セッション情報をモック
         handler.get_secure_cookie = Mock(return_value=b'user123')
-        handler.get_current_user_id = Mock(return_value="user123")
 
         # When: セッション確認
         user_id = handler.get_current_user_id()
@@ -120,36 +135,23 @@ class TestReviewAuthentication:
         # Then: 正しいユーザーIDが取得される
         assert user_id == "user123"
 
-    @pytest.mark.asyncio
-    async def test_expired_session_handling(self):
-        """期限切れセッションの処理テスト"""
-        # Given: 期限切れのセッション
-        handler = ReviewCreateHandler()
-        handler.get_secure_cookie = Mock(return_value=None)  # 期限切れ
-        handler.get_current_user_id = Mock(return_value=None)
-
-        # When: レビュー投稿を試行
-        with pytest.raises(tornado.web.HTTPError) as exc_info:
-            await handler.post("company123")
-
-        # Then: 401エラーが発生
-        assert exc_info.value.status_code == 401
-
 
 class TestUserAuthenticationService:
     """ユーザー認証サービスのテスト"""
 
+    @pytest.fixture
+    def auth_service(self):
+        """認証ミドルウェア（ユーザー情報をキャッシュするため、テストごとに生成する）"""
+        return AuthMiddleware()
+
     @pytest.mark.asyncio
-    async def test_get_user_from_session(self):
+    async def test_get_user_from_session(self, auth_service, now):
         """セッションからユーザー情報を取得するテスト"""
         # Given: 認証サービスとセッション情報
-        from src.middleware.auth_middleware import AuthMiddleware
-        auth_service = AuthMiddleware()
-
         session_data = {
             "user_id": "user123",
             "email": "test@example.com",
-            "created_at": datetime.utcnow() - timedelta(hours=1)
+            "created_at": now - timedelta(hours=1)
         }
 
         # When: セッションからユーザー情報を取得
@@ -161,12 +163,9 @@ class TestUserAuthenticationService:
         assert result["email"] == "test@example.com"
 
     @pytest.mark.asyncio
-    async def test_validate_session_token(self):
+    async def test_validate_session_token(self, auth_service):
         """セッショントークンの検証テスト"""
         # Given: 認証サービスと有効なトークン
-        from src.middleware.auth_middleware import AuthMiddleware
-        auth_service = AuthMiddleware()
-
         valid_token = "valid_session_token_123"
 
         # When: トークンを検証
@@ -177,12 +176,9 @@ class TestUserAuthenticationService:
         assert is_valid is True
 
     @pytest.mark.asyncio
-    async def test_invalidate_expired_sessions(self):
+    async def test_invalidate_expired_sessions(self, auth_service):
         """期限切れセッションの無効化テスト"""
         # Given: 期限切れのセッション
-        from src.middleware.auth_middleware import AuthMiddleware
-        auth_service = AuthMiddleware()
-
         expired_token = "expired_session_token_456"
 
         # When: 期限切れトークンを検証
@@ -218,7 +214,7 @@ class TestReviewPermissionIntegration:
         assert permission["existing_review_id"] is None
 
     @pytest.mark.asyncio
-    async def test_review_update_permission_within_one_year(self):
+    async def test_review_update_permission_within_one_year(self, now):
         """1年以内のレビュー更新権限テスト"""
         # Given: 6ヶ月前に投稿されたレビュー
         service = ReviewSubmissionService()
@@ -232,7 +228,7 @@ class TestReviewPermissionIntegration:
             "_id": "review123",
             "user_id": user_id,
             "company_id": company_id,
-            "created_at": datetime.utcnow() - timedelta(days=180),
+            "created_at": now - timedelta(days=180),
             "is_active": True
         }
 
@@ -248,7 +244,7 @@ class TestReviewPermissionIntegration:
         assert permission["days_until_next"] > 0
 
     @pytest.mark.asyncio
-    async def test_review_permission_after_one_year(self):
+    async def test_review_permission_after_one_year(self, now):
         """1年経過後の新規投稿権限テスト"""
         # Given: 13ヶ月前に投稿されたレビュー
         service = ReviewSubmissionService()
@@ -262,7 +258,7 @@ class TestReviewPermissionIntegration:
             "_id": "review123",
             "user_id": user_id,
             "company_id": company_id,
-            "created_at": datetime.utcnow() - timedelta(days=400),
+            "created_at": now - timedelta(days=400),
             "is_active": True
         }
 
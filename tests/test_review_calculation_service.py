@@ -7,193 +7,147 @@ from src.services.review_calculation_service import ReviewCalculationService
 from src.models.review import Review, ReviewCategory, EmploymentStatus
 
 
+@pytest.fixture(scope="module")
+def calc_service():
+    """計算サービス（状態を持たないため、モジュール内で一度だけ生成）"""
+    return ReviewCalculationService()
+
+
 class TestReviewCalculationService:
     """ReviewCalculationServiceのテスト"""
 
-    def setup_method(self):
-        """各テスト前の準備"""
-        self.calc_service = ReviewCalculationService()
-
-    def test_calculate_individual_average_all_answered(self):
-        """全項目に回答した場合の個別平均点計算"""
-        ratings = {
+    @pytest.mark.parametrize('ratings,expected_average,expected_count', [
+        # 全項目に回答: (4+3+5+2+4+3)/6 = 3.5
+        pytest.param({
             "recommendation": 4,
             "foreign_support": 3,
             "company_culture": 5,
             "employee_relations": 2,
             "evaluation_system": 4,
             "promotion_treatment": 3
-        }
-
-        average, count = self.calc_service.calculate_individual_average(ratings)
-
-        # (4+3+5+2+4+3)/6 = 3.5
-        assert average == 3.5
-        assert count == 6
-
-    def test_calculate_individual_average_partial_answers(self):
-        """一部項目のみ回答した場合の個別平均点計算"""
-        ratings = {
+        }, 3.5, 6, id='all_answered'),
+        # 一部項目のみ回答: (4+2+5)/3 = 3.67 → 3.7 (小数第1位まで四捨五入)
+        pytest.param({
             "recommendation": 4,
-            "foreign_support": None,  # 回答しない
+            "foreign_support": None,
             "company_culture": 2,
-            "employee_relations": None,  # 回答しない
+            "employee_relations": None,
             "evaluation_system": 5,
-            "promotion_treatment": None  # 回答しない
-        }
-
-        average, count = self.calc_service.calculate_individual_average(ratings)
-
-        # (4+2+5)/3 = 3.67 → 3.7 (小数第1位まで四捨五入)
-        assert average == 3.7
-        assert count == 3
-
-    def test_calculate_individual_average_no_answers(self):
-        """全項目未回答の場合の個別平均点計算"""
-        ratings = {
+            "promotion_treatment": None
+        }, 3.7, 3, id='partial_answers'),
+        # 全項目未回答
+        pytest.param({
             "recommendation": None,
             "foreign_support": None,
             "company_culture": None,
             "employee_relations": None,
             "evaluation_system": None,
             "promotion_treatment": None
-        }
-
-        average, count = self.calc_service.calculate_individual_average(ratings)
-
-        assert average == 0.0
-        assert count == 0
-
-    def test_calculate_individual_average_single_answer(self):
-        """1項目のみ回答した場合の個別平均点計算"""
-        ratings = {
+        }, 0.0, 0, id='no_answers'),
+        # 1項目のみ回答
+        pytest.param({
             "recommendation": 5,
             "foreign_support": None,
             "company_culture": None,
             "employee_relations": None,
             "evaluation_system": None,
             "promotion_treatment": None
-        }
-
-        average, count = self.calc_service.calculate_individual_average(ratings)
-
-        assert average == 5.0
-        assert count == 1
-
-    def test_calculate_individual_average_edge_values(self):
-        """境界値（最低・最高評価）での個別平均点計算"""
-        ratings = {
-            "recommendation": 1,  # 最低評価
-            "foreign_support": 5,  # 最高評価
+        }, 5.0, 1, id='single_answer'),
+        # 境界値（最低・最高評価）: (1+5)/2 = 3.0
+        pytest.param({
+            "recommendation": 1,
+            "foreign_support": 5,
             "company_culture": None,
             "employee_relations": None,
             "evaluation_system": None,
             "promotion_treatment": None
-        }
-
-        average, count = self.calc_service.calculate_individual_average(ratings)
-
-        # (1+5)/2 = 3.0
-        assert average == 3.0
-        assert count == 2
-
-    def test_calculate_individual_average_rounding_up(self):
-        """四捨五入（切り上げ）のテスト"""
-        ratings = {
+        }, 3.0, 2, id='edge_values'),
+        # 四捨五入（切り上げ）: (3+4)/2 = 3.5 (そのまま)
+        pytest.param({
             "recommendation": 3,
             "foreign_support": 4,
             "company_culture": None,
             "employee_relations": None,
             "evaluation_system": None,
             "promotion_treatment": None
-        }
-
-        average, count = self.calc_service.calculate_individual_average(ratings)
-
-        # (3+4)/2 = 3.5 (そのまま)
-        assert average == 3.5
-        assert count == 2
-
-    def test_calculate_individual_average_rounding_down(self):
-        """四捨五入（切り捨て）のテスト"""
-        ratings = {
+        }, 3.5, 2, id='rounding_up'),
+        # 四捨五入（切り捨て）: (2+2+3)/3 = 2.33... → 2.3
+        pytest.param({
             "recommendation": 2,
             "foreign_support": 2,
             "company_culture": 3,
             "employee_relations": None,
             "evaluation_system": None,
             "promotion_treatment": None
-        }
-
-        average, count = self.calc_service.calculate_individual_average(ratings)
-
-        # (2+2+3)/3 = 2.33... → 2.3
-        assert average == 2.3
-        assert count == 3
-
-    def test_validate_rating_values_valid(self):
-        """有効な評価値のバリデーション"""
-        ratings = {
+        }, 2.3, 3, id='rounding_down'),
+    ])
+    def test_calculate_individual_average(
+        self, calc_service, ratings, expected_average, expected_count
+    ):
+        """個別平均点と回答数の計算"""
+        average, count = calc_service.calculate_individual_average(ratings)
+
+        assert average == expected_average
+        assert count == expected_count
+
+    @pytest.mark.parametrize('ratings,expected_error_count,expected_fields', [
+        # 有効な評価値
+        pytest.param({
             "recommendation": 1,
             "foreign_support": 3,
             "company_culture": 5,
             "employee_relations": None
-        }
-
-        errors = self.calc_service.validate_rating_values(ratings)
-        assert len(errors) == 0
-
-    def test_validate_rating_values_invalid_range(self):
-        """無効な範囲の評価値のバリデーション"""
-        ratings = {
+        }, 0, (), id='valid'),
+        # 無効な範囲（下限・上限の範囲外）
+        pytest.param({
             "recommendation": 0,  # 範囲外（下限）
             "foreign_support": 6,  # 範囲外（上限）
             "company_culture": 3,  # 正常
             "employee_relations": None  # 正常（未回答）
-        }
-
-        errors = self.calc_service.validate_rating_values(ratings)
-        assert len(errors) == 2
-        assert "recommendation" in str(errors)
-        assert "foreign_support" in str(errors)
-
-    def test_validate_rating_values_invalid_type(self):
-        """無効な型の評価値のバリデーション"""
-        ratings = {
+        }, 2, ("recommendation", "foreign_support"), id='invalid_range'),
+        # 無効な型
+        pytest.param({
             "recommendation": "4",  # 文字列
             "foreign_support": 3.5,  # 小数
             "company_culture": True,  # 真偽値
             "employee_relations": None  # 正常（未回答）
-        }
-
-        errors = self.calc_service.validate_rating_values(ratings)
-        assert len(errors) == 3
-
-    def test_validate_required_categories(self):
-        """必須カテゴリーの存在確認"""
-        ratings = {
+        }, 3, (), id='invalid_type'),
+    ])
+    def test_validate_rating_values(
+        self, calc_service, ratings, expected_error_count, expected_fields
+    ):
+        """評価値のバリデーション"""
+        errors = calc_service.validate_rating_values(ratings)
+
+        assert len(errors) == expected_error_count
+        for field in expected_fields:
+            assert any(field in error for error in errors), f"{field} のエラーがない"
+
+    @pytest.mark.parametrize('ratings,expected_error_count,expected_fields', [
+        # company_culture が存在しない
+        pytest.param({
             "recommendation": 4,
             "foreign_support": 3,
-            # company_culture が存在しない
             "employee_relations": 5,
             "evaluation_system": 2,
             "promotion_treatment": 4
-        }
-
-        errors = self.calc_service.validate_required_categories(ratings)
-        assert len(errors) == 1
-        assert "company_culture" in str(errors)
-
-    def test_validate_required_categories_all_present(self):
-        """全必須カテゴリーが存在する場合"""
-        ratings = {
+        }, 1, ("company_culture",), id='missing_category'),
+        # 全必須カテゴリーが存在する（未回答でもキーは存在）
+        pytest.param({
             "recommendation": 4,
             "foreign_support": 3,
-            "company_culture": None,  # 未回答でもキーは存在
+            "company_culture": None,
             "employee_relations": 5,
             "evaluation_system": 2,
             "promotion_treatment": 4
-        }
+        }, 0, (), id='all_present'),
+    ])
+    def test_validate_required_categories(
+        self, calc_service, ratings, expected_error_count, expected_fields
+    ):
+        """必須カテゴリーの存在確認"""
+        errors = calc_service.validate_required_categories(ratings)
 
-        errors = self.calc_service.validate_required_categories(ratings)
-        assert len(errors) == 0
\ No newline at end of file
+        assert len(errors) == expected_error_count
+        for field in expected_fields:
+            assert any(field in error for error in errors), f"{field} のエラーがない"
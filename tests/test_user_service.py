@@ -298,6 +298,23 @@ class TestUserServiceBulkOperations:
         result = await service.bulk_update_user_status(user_ids, is_active=False)
         assert result == 2
 
+    @pytest.mark.asyncio
+    async def test_bulk_update_user_status_notifies_only_on_success(self):
+        """一括更新が成功した場合のみ変更通知が呼び出されるテスト"""
+        changed = []
+        mock_db = AsyncMock()
+        mock_db.bulk_update.side_effect = Exception('write failed')
+
+        service = UserService(mock_db, on_user_changed=changed.append)
+
+        assert await service.bulk_update_user_status(['id1'], is_active=False) == 0
+        assert changed == []
+
+        mock_db.bulk_update.side_effect = None
+        mock_db.bulk_update.return_value = 2
+        assert await service.bulk_update_user_status(['id1', 'id2'], is_active=False) == 2
+        assert changed == ['id1', 'id2']
+
 
 class TestUserServiceIndexing:
     """ユーザー検索インデックス機能テスト"""